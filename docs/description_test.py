@@ -0,0 +1,89 @@
+"""
+Differential test of DescriptionWriter in generateDocs.py.
+
+Converts the description of every compound and member in the doxygen xml both with markup_description, which builds
+it in bs4, and with DescriptionWriter, and checks that the html and the text check of both are identical. Also prints
+how long each of them took.
+
+Usage: python description_test.py [xml directory]
+"""
+
+import os
+import sys
+import time
+
+# generateDocs adds the bundled libs to the path
+import generateDocs
+from generateDocs import XML_SOURCE_PATH, DescriptionWriter, markup_description, parse_xml
+from bs4 import BeautifulSoup
+
+
+def get_description_trees(xml_path):
+    """
+    Parses the xml files of a directory and collects the elements that have descriptions
+    :return: list of (file name, element) tuples
+    """
+    trees = []
+    for file_name in sorted(os.listdir(xml_path)):
+        if not file_name.endswith(".xml"):
+            continue
+        xml_tree = parse_xml(os.path.join(xml_path, file_name))
+        if xml_tree is None:
+            continue
+        for element in xml_tree.iter():
+            if element.tag in ("compounddef", "memberdef"):
+                trees.append((file_name, element))
+    return trees
+
+
+def convert_all(trees, convert):
+    results = []
+    start = time.time()
+    for file_name, tree in trees:
+        results.append(convert(tree))
+    return results, time.time() - start
+
+
+def convert_bs4(tree):
+    description_el = markup_description(BeautifulSoup(), tree)
+    return str(description_el), len(description_el.text) > 0
+
+
+def convert_writer(tree):
+    writer = DescriptionWriter()
+    try:
+        return writer.write_description(tree), writer.has_text
+    except DescriptionWriter.Unsupported:
+        return None
+
+
+def main(argv):
+    xml_path = argv[1] if len(argv) > 1 else XML_SOURCE_PATH
+    generateDocs.args = generateDocs.parser.parse_args([])
+    generateDocs.logger = generateDocs.Logger()
+    trees = get_description_trees(xml_path)
+
+    print "Converting %d descriptions from %s" % (len(trees), xml_path)
+    expected, bs4_seconds = convert_all(trees, convert_bs4)
+    results, writer_seconds = convert_all(trees, convert_writer)
+
+    unsupported = 0
+    mismatches = 0
+    for (file_name, tree), expected_result, result in zip(trees, expected, results):
+        if result is None:
+            unsupported += 1
+        elif result != expected_result:
+            mismatches += 1
+            if mismatches <= 10:
+                print "Mismatch in %s (%s):" % (file_name, tree.get("id"))
+                print "  bs4:    %r" % (expected_result,)
+                print "  writer: %r" % (result,)
+
+    print "%-10s %8.3f s" % ("bs4", bs4_seconds)
+    print "%-10s %8.3f s" % ("writer", writer_seconds)
+    print "%d mismatches, %d left to bs4 as unsupported" % (mismatches, unsupported)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -29,13 +29,27 @@ z
 import sys
 import codecs
 import re
-import xml.etree.ElementTree as ET
+try:
+    import xml.etree.cElementTree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 import json
 import os
 import shutil
-import stat
 import argparse
 import posixpath
+import multiprocessing
+import multiprocessing.pool
+import hashlib
+import functools
+import gc
+import copy_reg
+import cPickle as pickle
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from contextlib import contextmanager
 from datetime import datetime
 from difflib import SequenceMatcher as SM
 from posixpath import join as urljoin
@@ -44,9 +58,14 @@ from posixpath import join as urljoin
 sys.path.append("libs/")
 sys.path.append("python/")
 from bs4 import BeautifulSoup, Tag, NavigableString, Comment
+from bs4.element import PreformattedString
 from pystache.renderer import Renderer, Loader
+from pystache.locator import Locator
+from pystache.parser import parse as parse_template
+from pystache.common import TemplateNotFoundError
 
-from utils import Logger
+from utils import Logger, Profiler
+from lunr_index import LunrIndex, PIPELINE as LUNR_PIPELINE
 
 # static path vars
 BASE_PATH = os.path.dirname(os.path.realpath(__file__)) + os.sep
@@ -57,6 +76,17 @@ HTML_SOURCE_PATH = BASE_PATH + 'htmlsrc' + os.sep
 TEMPLATE_PATH = BASE_PATH + 'htmlsrc' + os.sep + "_templates" + os.sep
 PARENT_DIR = BASE_PATH.split(os.sep + 'docs')[0]
 TAG_FILE_PATH = "doxygen" + os.sep + "cinder.tag"
+# tag that marks where the page content goes in the master template
+MAIN_CONTENT_PLACEHOLDER = "main-content-placeholder"
+# tag that marks where a shared fragment, like the namespace nav, goes in a page
+SHARED_FRAGMENT_PLACEHOLDER = "shared-fragment-placeholder"
+# fields of the lunr search index and their boosts, as searched by cinder.js
+SEARCH_INDEX_FIELDS = [("title", 5), ("tags", 10), ("body", 1)]
+# directory in the html dir with the string table and the shards of the search index
+SEARCH_INDEX_DIR = "search_index"
+SEARCH_INDEX_SHARDS = ["classes", "namespaces", "guides", "glm"]
+# links of the pages that go into the glm shard, besides the glm modules
+GLM_LINK = re.compile(r"(^|/)((class|struct|namespace)glm(_1_1|\.html)|group__)")
 
 # TODO: These should be dynamic via doxygen generated data. perhaps from _cinder_8h.xml
 docs_meta = {
@@ -81,6 +111,56 @@ parser.add_argument('--root',
 parser.add_argument('--include-analytics',
     action='store_true',
     help='bool as to wheather to include analytics in frontend')
+parser.add_argument('--full',
+    action='store_true',
+    help='regenerate every page, even the ones that have not changed since the last build')
+parser.add_argument('-j', '--jobs',
+    type=int,
+    default=1,
+    help='number of worker processes used to generate pages (0 uses one per cpu)')
+parser.add_argument('--profile',
+    nargs='?',
+    const=BASE_PATH + "build_profile",
+    metavar='PATH',
+    help='time the build phases and pages, count the symbol lookups and write a report to PATH.json and PATH.txt '
+         '(defaults to build_profile next to this script)')
+parser.add_argument('--log-file',
+    metavar='PATH',
+    help='also append every message, including the ones only shown with --debug, to PATH as json lines')
+parser.add_argument('--copy-mode',
+    choices=['copy', 'hardlink', 'reflink'],
+    default='copy',
+    help='how assets are put into the html dir: copied, hard linked to htmlsrc, or reflinked where the file system '
+         'supports it. Linking falls back to copying')
+parser.add_argument('--record-contexts',
+    metavar='PATH',
+    help='save the context of the largest page rendered with each template to a json file, '
+         'for benchmarking the templates with libs/pystache/tests/benchmark.py (use with --full)')
+
+
+class NameRule(object):
+    """
+    Tests names against a list of prefixes, or of strings that they must not contain, with a single regex,
+    and remembers the verdict for each name
+    """
+
+    def __init__(self, strings, prefix=True):
+        """
+        :param strings: list of prefixes or substrings
+        :param prefix: True to match the start of names, False to match anywhere in them
+        """
+        self.test = None
+        if strings:
+            pattern = re.compile("|".join(re.escape(string) for string in strings))
+            self.test = pattern.match if prefix else pattern.search
+        self.verdicts = {}
+
+    def matches(self, name):
+        try:
+            return self.verdicts[name]
+        except KeyError:
+            verdict = self.verdicts[name] = self.test is not None and self.test(name) is not None
+            return verdict
 
 
 # various config settings
@@ -175,15 +255,41 @@ class Config(object):
             "source_file_ext": "hpp"
         }
 
+        # the lists above compiled to NameRules, these are checked for every symbol
+        self._namespace_whitelist = NameRule([ns["name"] for ns in self.NAMESPACE_WHITELIST])
+        self._namespace_blacklist = NameRule(self.NAMESPACE_BLACKLIST)
+        self._class_blacklist = NameRule(self.CLASS_LIST_BLACKLIST, False)
+        # NameRules of the prefix_blacklist of each section config
+        self._prefix_blacklists = {}
+
     def is_namespace_whitelisted(self, ns_str):
-        if any([ns_str.startswith(prefix["name"]) for prefix in self.NAMESPACE_WHITELIST]):
+        if self._namespace_whitelist.matches(ns_str):
             return True
         return None
 
     def is_namespace_blacklisted(self, ns_str):
-        if any([ns_str.startswith(prefix) for prefix in self.NAMESPACE_BLACKLIST]):
-            return True
-        return False
+        return self._namespace_blacklist.matches(ns_str)
+
+    def is_class_blacklisted(self, class_str):
+        """
+        :param class_str: class name or path of the class' file
+        :return: True if it contains any of the CLASS_LIST_BLACKLIST strings
+        """
+        return self._class_blacklist.matches(class_str)
+
+    def is_prefix_blacklisted(self, section_config, name):
+        """
+        :param section_config: config of a section of a whitelisted namespace
+        :param name: name of a member of the section
+        :return: True if the name starts with any of the section's prefix_blacklist strings
+        """
+        prefix_blacklist = section_config.get("prefix_blacklist") if section_config else None
+        if not prefix_blacklist:
+            return False
+        key = tuple(prefix_blacklist)
+        if key not in self._prefix_blacklists:
+            self._prefix_blacklists[key] = NameRule(prefix_blacklist)
+        return self._prefix_blacklists[key].matches(name)
 
     def get_ns_config(self, ns_str):
         for ns in self.NAMESPACE_WHITELIST:
@@ -221,6 +327,12 @@ class State(object):
     def __init__(self):
         self.html_files = []
         self.processed_html_files = False
+        # side effects of the page being processed in a worker process, handed back to the parent process
+        self.page_record = None
+        # inputs of the page being generated, saved to the build manifest
+        self.build_record = None
+        self.build_fingerprints = None
+        self.lookup_depth = 0
 
     def add_html_file(self, file):
         self.html_files.append(file)
@@ -240,9 +352,15 @@ tagDictionary = {
 
 
 # globals
-g_tag_xml = None
 g_symbolMap = None
 g_search_index = None
+g_build_manifest = None
+g_template_fingerprints = {}
+g_template_cache = None
+g_member_cache = None
+g_path_resolver = None
+g_shared_fragments = {}
+g_profiler = None
 config = Config()
 state = State()
 logger = None
@@ -250,6 +368,79 @@ logger = None
 
 # =========================================================================================================== SYMBOL MAP
 
+def recorded_lookup(method):
+    """
+    Decorates a SymbolMap lookup so that the symbols a page resolves are recorded in the build manifest
+    :param method: SymbolMap method to decorate
+    :return: decorated method
+    """
+    @functools.wraps(method)
+    def lookup(self, *args):
+        if g_profiler is not None:
+            g_profiler.count_lookup(method.__name__, args)
+
+        if state.build_record is None:
+            return method(self, *args)
+
+        # only record the outermost lookup, since replaying it repeats the nested ones
+        state.lookup_depth += 1
+        try:
+            result = method(self, *args)
+        finally:
+            state.lookup_depth -= 1
+
+        if state.lookup_depth == 0:
+            record_lookup(method.__name__, args, result)
+        return result
+    return lookup
+
+
+class ShortNameIndex(object):
+    """
+    Index of the symbols in the cinder namespace by their name without namespace, so that a symbol can be found by its
+    short name without scanning every key. Finds the same symbol as scanning the dict for the first matching key.
+    """
+    def __init__(self, symbols):
+        self.symbols = symbols
+        # keys by short name
+        self.names = {}
+        # first key in iteration order for short names that more than one key has
+        self.first_keys = None
+        # a key that makes the scan throw, in which case we have to keep scanning
+        self.scan_only = False
+
+    def add(self, key):
+        if key.find("cinder") == 0 and len(key.split("::")) > 1:
+            parts = key.split("cinder::")
+            if len(parts) < 2:
+                self.scan_only = True
+                return
+            self.names.setdefault(parts[1].rsplit("::", 1)[-1], []).append(key)
+            # adding to the dict can change its iteration order
+            self.first_keys = None
+
+    def find(self, short_name):
+        if self.scan_only:
+            for key in self.symbols:
+                if key.find("cinder") == 0 and len(key.split("::")) > 1:
+                    if key.split("cinder::")[1].rsplit("::", 1)[-1] == short_name:
+                        return key
+            return None
+
+        keys = self.names.get(short_name)
+        if not keys:
+            return None
+        elif len(keys) == 1:
+            return keys[0]
+
+        if self.first_keys is None:
+            self.first_keys = {}
+            for key in self.symbols:
+                if key.find("cinder") == 0 and len(key.split("::")) > 1:
+                    self.first_keys.setdefault(key.split("cinder::")[1].rsplit("::", 1)[-1], key)
+        return self.first_keys.get(short_name)
+
+
 # mapping for the tag file with helper functions
 class SymbolMap(object):
     def __init__(self):
@@ -261,6 +452,24 @@ class SymbolMap(object):
         self.enums = {}
         self.groups = {}
 
+        # lookup indexes, kept up to date by add_class and add_typedef
+        self.class_index = ShortNameIndex(self.classes)
+        self.typedef_index = ShortNameIndex(self.typedefs)
+        self.found_classes = {}
+        self.found_typedefs = {}
+        self.found_functions = {}
+        # functions by name, for each class or namespace and for all groups
+        self.scope_functions = {}
+        self.group_functions = None
+        # SequenceMatcher ratios of argument pairs
+        self.arg_ratios = {}
+
+        # inheritance graph, built by build_class_graph
+        self.class_parents = None
+        self.class_children = None
+        self.class_lineages = {}
+        self.class_ancestors = {}
+
     class Class(object):
         def __init__(self, class_tree):
 
@@ -336,7 +545,15 @@ class SymbolMap(object):
             self.name = member_tree.find("name").text
             self.base = base_class
             self.path = member_tree.find("anchorfile").text + "#" + anchor
-            self.args = parse_arg_list(member_tree.find("arglist").text)
+            self.arglist = member_tree.find("arglist").text
+            self._args = None
+
+        @property
+        def args(self):
+            # only functions that are looked up by their arguments need them parsed
+            if self._args is None:
+                self._args = parse_arg_list(self.arglist)
+            return self._args
 
     class File(object):
         def __init__(self, name, path, typedefs):
@@ -357,7 +574,7 @@ class SymbolMap(object):
             self.title = tree.find("title").text
             self.path = HTML_SOURCE_PATH + tree.find('filename').text
             self.src_path = (XML_SOURCE_PATH + tree.find('filename').text).replace(".html", ".xml")
-            self.description = self.extract_description()
+            self._description = None
             self.functionList = []
             self.subgroup_names = []
             self.subgroups = []
@@ -365,6 +582,13 @@ class SymbolMap(object):
             self.tags.append(strip_compound_name(self.name))
             self.prefix_content = None
 
+        @property
+        def description(self):
+            # read from the group's xml file, which only the pages that list groups need
+            if self._description is None:
+                self._description = self.extract_description()
+            return self._description
+
         def extract_description(self):
             xml_tree = parse_xml(self.src_path)
             bs4 = BeautifulSoup()
@@ -394,13 +618,48 @@ class SymbolMap(object):
 
     def add_function(self, ns, fn_name, fn_obj):
         self.functions[ns + "::" + fn_name] = fn_obj
+        self.symbols_changed()
+
+    def add_class(self, name, class_obj):
+        if name not in self.classes:
+            self.class_index.add(name)
+        self.classes[name] = class_obj
+        self.symbols_changed()
+
+    def add_typedef(self, name, typedef_obj):
+        if name not in self.typedefs:
+            self.typedef_index.add(name)
+        self.typedefs[name] = typedef_obj
+        self.symbols_changed()
+
+    def symbols_changed(self):
+        """ drops the memoized lookups and the indexes built from them, since a new symbol can change the results.
+            symbols are only added while parsing the tag file, before any page looks them up """
+        self.found_classes.clear()
+        self.found_typedefs.clear()
+        self.found_functions.clear()
+        self.scope_functions.clear()
+        self.group_functions = None
+        self.class_parents = None
+        self.class_children = None
+        self.class_lineages = {}
+        self.class_ancestors = {}
 
     # searches the symbolMap for a given symbol, prepending cinder:: if not found as-is
     # returns a class
+    @recorded_lookup
     def find_class(self, name):
 
-        # replace leading ci:: with cinder:: instead
         searchname = str(name)
+        if searchname in self.found_classes:
+            return self.found_classes[searchname]
+
+        found = self.search_class(searchname)
+        self.found_classes[searchname] = found
+        return found
+
+    def search_class(self, searchname):
+        # replace leading ci:: with cinder:: instead
         if searchname.find("ci::") == 0:
             searchname = searchname.replace("ci::", "cinder::")
 
@@ -412,13 +671,10 @@ class SymbolMap(object):
             return self.classes["cinder::" + searchname]
 
         else:
-            # iterate through all of the classes with namespace "cinder::" and test against just class name
-            for className in self.classes:
-                # if className has "cinder::" and namespace depth > 1, test against name
-                if className.find("cinder") == 0 and len(className.split("::")) > 1:
-                    testname = className.split("cinder::")[1].rsplit("::", 1)[-1]
-                    if testname == searchname:
-                        return self.classes[className]
+            # find a class with namespace "cinder::" by just the class name
+            className = self.class_index.find(searchname)
+            if className is not None:
+                return self.classes[className]
 
             # check to see if the name is a typedef that is a shared_ptr to another class
             typedef = self.find_typedef(searchname)
@@ -441,6 +697,7 @@ class SymbolMap(object):
 
             return None
 
+    @recorded_lookup
     def find_namespace(self, name):
 
         searchname = str(name)
@@ -457,6 +714,7 @@ class SymbolMap(object):
 
         return None
 
+    @recorded_lookup
     def find_group(self, name):
         return self.groups.get(name)
 
@@ -500,13 +758,22 @@ class SymbolMap(object):
         namespaces = sorted(namespaces, key=lambda s: s.name.lower())
         return namespaces
 
+    @recorded_lookup
     def find_typedef(self, name):
         searchname = str(name)
+        if searchname in self.found_typedefs:
+            return self.found_typedefs[searchname]
+
+        found = self.search_typedef(searchname)
+        self.found_typedefs[searchname] = found
+        return found
+
+    def search_typedef(self, searchname):
         if searchname.find("ci::") == 0:
             searchname = searchname.replace("ci::", "cinder::")
 
         # same key as name
-        if searchname in self.typedefs.keys():
+        if searchname in self.typedefs:
             return self.typedefs[searchname]
 
         # key with "cinder::" prepended
@@ -518,30 +785,30 @@ class SymbolMap(object):
             return self.typedefs["glm::" + searchname]
 
         else:
-            # iterate through all of the classes with namespace "cinder::" and test against just class name
-            for typedef in self.typedefs:
-                if typedef.find("cinder") == 0 and len(typedef.split("::")) > 1:
-                    testname = typedef.split("cinder::")[1].rsplit("::", 1)[-1]
-                    if testname == searchname:
-                        return self.typedefs[typedef]
+            # find a typedef with namespace "cinder::" by just the typedef name
+            typedef = self.typedef_index.find(searchname)
+            if typedef is not None:
+                return self.typedefs[typedef]
         return None
 
 
+    @recorded_lookup
     def find_function(self, name, argstring=""):
+        argstring = str(argstring)
+        key = (name if type(name) in (str, unicode) else unicode(name), argstring)
+        if key not in self.found_functions:
+            self.found_functions[key] = self.search_function(name, argstring)
+        return self.found_functions[key]
+
+    def search_function(self, name, argstring):
 
         # find function name without namespace and parenthesis
         fn_name = strip_compound_name(name.split('(')[0])
 
         # find args and amt of args
-        args = parse_arg_list(str(argstring))
+        args = parse_arg_list(argstring)
         arg_len = len(args)
 
-        # non-optional arguments for the function
-        req_arg_len = 0
-        for arg in args:
-            if arg.find("=") < 0:
-                req_arg_len += 1
-
         # find parent class first
         class_parts = name.split("(")[0].split("::")
         class_name = "::".join(class_parts[:-1])
@@ -554,12 +821,10 @@ class SymbolMap(object):
                 ns_search = "cinder"
             ref_obj = g_symbolMap.find_namespace(ns_search)
 
-        # iterate through class/namespace functions
+        # class/namespace functions
         fn_list = []
         if ref_obj:
-            for fn in ref_obj.functionList:
-                if fn.name == fn_name:
-                    fn_list.append(fn)
+            fn_list.extend(self.get_scope_functions(ref_obj).get(fn_name, []))
 
         # try with cinder::app prefix
         # TODO: refactor a bit with the ability to whitespace different namespaces test
@@ -569,29 +834,13 @@ class SymbolMap(object):
                 ns_search = "cinder::app"
             ref_obj = g_symbolMap.find_namespace(ns_search)
 
-            # iterate through class/namespace functions
+            # class/namespace functions
             if ref_obj:
-                for fn in ref_obj.functionList:
-                    if fn.name == fn_name:
-                        fn_list.append(fn)
+                fn_list.extend(self.get_scope_functions(ref_obj).get(fn_name, []))
 
-        # iterate through glm groups
+        # glm group functions
         if len(fn_list) == 0:
-            for group in self.groups:
-                group_ref = self.groups[group]
-                for fn in group_ref.functionList:
-                    if fn.name == fn_name:
-                        fn_list.append(fn)
-
-        # else:
-        #     for fn_key in self.functions:
-        #         # print self.func
-        #         # print self.functions[fn].name
-        #         fn = self.functions[fn_key]
-        #         if fn.name == fn_name:
-        #             fn_list.append(fn)
-        #             print "found match"
-        #             print fn.args
+            fn_list.extend(self.get_group_functions().get(fn_name, []))
 
         # no functions found in class or namespaces, try search by name
         if len(fn_list) == 0:
@@ -604,27 +853,27 @@ class SymbolMap(object):
             best_score = 0
 
             for idx, fn in enumerate(fn_list):
-                # fn_arg_len = len(fn.args)
-                score = 0
-
                 # find amount of required arguments
                 fn_arg_len = 0
                 for arg in fn.args:
                     if arg.find("=") < 0:
                         fn_arg_len += 1
+                fn_args = fn.args[0:fn_arg_len]
+
+                # the same arguments as passed in can't be outscored
+                if fn_args == args:
+                    fn_index = idx
+                    break
+
+                score = 0
 
                 # if number of passed in args is the same as this function's arg length, add to the score
                 if arg_len == fn_arg_len:
                     score += 0.5
 
                 # loop through the amount of args in this function
-                fn_args = fn.args[0:fn_arg_len]
-                if len(fn_args) > 0:
-                    for i, arg in enumerate(fn_args):
-                        if i + 1 > arg_len:
-                            continue
-                        ratio = (SM(None, arg, args[i]).ratio())
-                        score += (ratio * 2.0)
+                for i, arg in enumerate(fn_args[0:arg_len]):
+                    score += (self.get_arg_ratio(arg, args[i]) * 2.0)
 
                 if score > best_score:
                     fn_index = idx
@@ -633,12 +882,39 @@ class SymbolMap(object):
         found_function = fn_list[fn_index] if len(fn_list) > 0 else None
         return found_function
 
+    def get_scope_functions(self, scope):
+        """ returns the functions of a class or namespace by name """
+        if id(scope) not in self.scope_functions:
+            functions = {}
+            for fn in scope.functionList:
+                functions.setdefault(fn.name, []).append(fn)
+            self.scope_functions[id(scope)] = functions
+        return self.scope_functions[id(scope)]
+
+    def get_group_functions(self):
+        """ returns the functions of all groups by name """
+        if self.group_functions is None:
+            self.group_functions = {}
+            for group in self.groups:
+                for fn in self.groups[group].functionList:
+                    self.group_functions.setdefault(fn.name, []).append(fn)
+        return self.group_functions
+
+    def get_arg_ratio(self, arg, search_arg):
+        key = (arg, search_arg)
+        if key not in self.arg_ratios:
+            self.arg_ratios[key] = SM(None, arg, search_arg).ratio()
+        return self.arg_ratios[key]
+
+    @recorded_lookup
     def find_file(self, name):
         return self.files.get(name)
 
+    @recorded_lookup
     def find_file_typedefs(self, name):
         return self.find_file(name).typedefs
 
+    @recorded_lookup
     def find_enum(self, name):
         searchname = str(name)
         if searchname.find("ci::") == 0:
@@ -659,28 +935,67 @@ class SymbolMap(object):
         elif ("cinder::" + searchname) in self.enums:
             return self.enums.get("cinder::" + searchname)
 
+    def build_class_graph(self):
+        """ resolves the base of every class once and groups the classes by the base they
+            inherit from, so that the hierarchy of a class doesn't need to search the map """
+        self.class_parents = {}
+        self.class_children = {}
+        self.class_lineages = {}
+        self.class_ancestors = {}
+
+        for class_key in self.classes:
+            class_obj = self.classes[class_key]
+            self.class_parents[class_key] = self.find_class(class_obj.base)
+            self.class_children.setdefault(class_obj.base, []).append(class_obj)
+
+    def get_class_parent(self, class_obj):
+        if self.class_parents is None:
+            self.build_class_graph()
+
+        if self.classes.get(class_obj.qualifiedName) is class_obj:
+            return self.class_parents[class_obj.qualifiedName]
+        return self.find_class(class_obj.base)
+
+    @recorded_lookup
+    def get_class_lineage(self, name):
+        """ returns the base classes of a class, starting with the root class """
+        if self.class_parents is None:
+            self.build_class_graph()
+
+        if name not in self.class_lineages:
+            class_obj = self.classes.get(name)
+            if class_obj is None:
+                return []
+
+            # guard against classes that inherit from themselves
+            self.class_lineages[name] = []
+            parent = self.get_class_parent(class_obj)
+            if parent is not None:
+                self.class_lineages[name] = self.get_class_lineage(parent.qualifiedName) + [parent]
+
+        return list(self.class_lineages[name])
+
+    @recorded_lookup
     def get_class_ancestors(self, name):
-        result = []
-        existingclass = self.find_class(name)
-        while existingclass and existingclass.base:
-            result.insert(0, existingclass)
-            existingclass = self.find_class(existingclass.base)
-
-        if result:
-            return result
-        else:
-            return []
+        if self.class_parents is None:
+            self.build_class_graph()
+
+        if name not in self.class_ancestors:
+            result = []
+            existingclass = self.find_class(name)
+            while existingclass and existingclass.base and existingclass not in result:
+                result.insert(0, existingclass)
+                existingclass = self.get_class_parent(existingclass)
+            self.class_ancestors[name] = result
+
+        return list(self.class_ancestors[name])
 
+    @recorded_lookup
     def get_class_descendants(self, name):
-        result = []
-        for aClass in self.classes:
-            if self.classes[aClass].base == name:
-                result.append(self.classes[aClass])
+        if self.class_children is None:
+            self.build_class_graph()
 
-        if result:
-            return result
-        else:
-            return []
+        return list(self.class_children.get(name, []))
 
     # def get_link_for_class(self, className):
     #     """ Get the link for the definition of a class.
@@ -700,6 +1015,7 @@ class SymbolMap(object):
         # sort by lowercased name
         return sorted(classes, key=lambda s: s.name.lower())
 
+    @recorded_lookup
     def find_classes_in_namespace(self, namespace, recursive=True):
         ns_classes = []
         for class_key in self.classes:
@@ -1000,7 +1316,7 @@ class HtmlFileData(FileData):
         content = dict(orig_content)
         template_content = {
             "html_content": self.html_content,
-            "namespace_nav": str(g_namespaceNav),
+            "namespace_nav": get_shared_fragment_markup("namespace_nav"),
             "pagenav": {
                 "list": self.pagenav,
                 "length": len(self.pagenav)
@@ -1083,6 +1399,113 @@ class GuideConfig(object):
         return nav
 
 
+class RawHtml(PreformattedString):
+    """
+    Markup that is written out as it is, so that serialized fragments can be put in a page without parsing them
+    """
+
+    def output_ready(self, formatter="minimal"):
+        return self
+
+
+class TemplateCache(object):
+    """
+    Keeps the parsed page templates and the partials they include, so that each template is read and parsed once,
+    and renders them with a single renderer. Templates are reloaded if their mtime changes.
+    """
+
+    def __init__(self, search_dirs):
+        self.search_dirs = search_dirs
+        # the renderer loads partials through get()
+        self.renderer = Renderer(file_encoding="utf-8", string_encoding="utf-8", decode_errors="xmlcharrefreplace", partials=self,
+                                 compiled=True)
+        self.loader = Loader(file_encoding="utf-8", to_unicode=self.renderer.unicode)
+        self.locator = Locator()
+
+        # template data by path
+        self.templates = {}
+        # partial paths by name
+        self.partial_paths = {}
+
+        # mtimes are checked once per render
+        self.render_count = 0
+        self.read_count = 0
+
+        # recorded contexts by path, when set to a dict
+        self.recorded_contexts = None
+
+    def render(self, path, content):
+        self.render_count += 1
+        output = self.renderer.render(self.load(path, True), content)
+
+        if self.recorded_contexts is not None:
+            recorded = self.recorded_contexts.get(path)
+            if recorded is None or recorded["size"] < len(output):
+                self.recorded_contexts[path] = {"size": len(output), "context": get_recordable_value(content)}
+        return output
+
+    def save_recorded_contexts(self, out_path):
+        """
+        Saves the recorded contexts by template file name
+        :param out_path: json file path
+        :return:
+        """
+        templates = []
+        for path in sorted(self.recorded_contexts):
+            templates.append({"template": os.path.basename(path), "context": self.recorded_contexts[path]["context"]})
+
+        with open(out_path, "wb") as out_file:
+            json.dump({"templates": templates}, out_file, indent=1, sort_keys=True)
+
+    def get(self, name):
+        """ Loads a partial by name for the renderer """
+        if name not in self.partial_paths:
+            try:
+                self.partial_paths[name] = self.locator.find_name(name, self.search_dirs)
+            except TemplateNotFoundError:
+                self.partial_paths[name] = None
+
+        if self.partial_paths[name] is None:
+            return None
+        return self.load(self.partial_paths[name])
+
+    def load(self, path, parsed=False):
+        template = self.templates.get(path)
+        if template is None or template["checked"] < self.render_count:
+            mtime = os.path.getmtime(path)
+            if template is None or template["mtime"] != mtime:
+                self.read_count += 1
+                template = {"mtime": mtime, "source": self.loader.read(path), "parsed": None}
+                self.templates[path] = template
+            template["checked"] = self.render_count
+
+        if not parsed:
+            return template["source"]
+        if template["parsed"] is None:
+            template["parsed"] = parse_template(template["source"])
+        return template["parsed"]
+
+
+def get_recordable_value(value):
+    """
+    Converts a template context to plain json data, keeping everything the templates can look up.
+    Markup is stored the way the templates print it.
+    :param value: context value
+    :return: json compatible value
+    """
+    if isinstance(value, dict):
+        return dict((key, get_recordable_value(item)) for key, item in value.iteritems())
+    if isinstance(value, (list, tuple)):
+        return [get_recordable_value(item) for item in value]
+    if value is None or isinstance(value, (bool, int, long, float, basestring)):
+        return value
+    if isinstance(value, (Tag, NavigableString)):
+        return unicode(value)
+    if hasattr(value, "__dict__"):
+        return get_recordable_value(vars(value))
+    return unicode(value)
+
+
 class LinkData(object):
 
     def __init__(self, link=None, label=None, active=True):
@@ -1287,6 +1710,19 @@ def extract_anchor(element):
 
 
 def define_link_tag(tag, attrib):
+    href = get_link_href(attrib)
+    if href is None:
+        log("DEFINING LINK TAG: " + str(tag), 1, key="DEFINING LINK TAG")
+    else:
+        tag["href"] = href
+
+
+def get_link_href(attrib):
+    """
+    Works out the link of a doxygen ref element, or of a link tag
+    :param attrib: attributes of the element
+    :return: the link, or None
+    """
     ref_id = None
     href = None
 
@@ -1313,10 +1749,7 @@ def define_link_tag(tag, attrib):
         anchor = data.find("anchor").text
         href = file_name + "#" + anchor
 
-    if href is None:
-        log("DEFINING LINK TAG: " + str(tag), 1)
-    else:
-        tag["href"] = href
+    return href
 
 
 def parse_member_definition(bs4, member, member_name=None):
@@ -1333,6 +1766,34 @@ def parse_member_definition(bs4, member, member_name=None):
 
     anchor = find_member_anchor(member)
 
+    # members such as the functions of glm groups appear in more than one xml file
+    member_id = member.attrib["id"]
+    markup = g_member_cache.get(member_id)
+    if markup is None:
+        markup = markup_member(bs4, member)
+        cache_member_markup(member_id, markup)
+
+    member_obj = {
+        "name": member_name,
+        "return": markup["return"],
+        "anchor": anchor,
+        "definition": {
+            "name": member_name,
+            "args": markup["args"]
+        },
+        "description": markup["description"]
+    }
+
+    return member_obj
+
+
+def markup_member(bs4, member):
+    """
+    Generates the markup of a member, which only depends on the member's own xml
+    :param bs4: beautifulsoup instance
+    :param member: the member to generate the markup for
+    :return: dict of the return type, argument string and description markup
+    """
     # return type
     return_div = gen_tag(bs4, "span")
     return_markup = iterate_markup(bs4, member.find(r"type"), return_div)
@@ -1351,21 +1812,25 @@ def parse_member_definition(bs4, member, member_name=None):
     argstring_text = argstring.text if argstring is not None else ""
 
     # description
-    description_div = markup_description(bs4, member)
-    description_str = str(description_div) if len(description_div.text) > 0 else None
+    description_str, has_description = markup_description_html(bs4, member)
+    if not has_description:
+        description_str = None
 
-    member_obj = {
-        "name": member_name,
-        "return": return_str,
-        "anchor": anchor,
-        "definition": {
-            "name": member_name,
-            "args": argstring_text
-        },
-        "description": description_str
-    }
+    return {"return": return_str, "args": argstring_text, "description": description_str}
 
-    return member_obj
+
+def cache_member_markup(member_id, markup):
+    """
+    Caches the markup of a member for its other occurrences, and for the next builds if the page is part of one
+    :param member_id: doxygen id of the member
+    :param markup: dict returned by markup_member
+    :return:
+    """
+    # the markup can be reused for as long as the xml of the page that it comes from is unchanged
+    markup["inputs"] = state.build_record["inputs"] if state.build_record is not None else None
+    g_member_cache.add(member_id, markup)
+    if state.page_record is not None:
+        state.page_record["members"].append([member_id, markup])
 
 
 def parse_function(bs4, member, class_name=None):
@@ -1423,29 +1888,6 @@ def define_tag(bs4, tag_name, tree):
     return new_tag
 
 
-def iter_class_base(class_def, hierarchy):
-    """ Iterates the class to find all of their base classes
-        and iterate through them
-
-    Args:
-        classDef: The instance of SymbolMap::Class Object whose base we are searching for
-        hierachy: The current hierachy of classes to append to if we find another base
-    """
-
-    if class_def is None or hasattr(class_def, 'name') is False:
-        return False
-
-    base = class_def.base
-
-    if base is None:
-        return False
-    else:
-        new_tree = g_symbolMap.find_class(base)
-        # add to hierarchy if it continues
-        if iter_class_base(new_tree, hierarchy) is not False:
-            hierarchy.append(new_tree)
-
-
 def gen_class_hierarchy(bs4, class_def):
     """ Generates the class hierarchy side bar, with each class linking
         out to its class file.
@@ -1463,11 +1905,8 @@ def gen_class_hierarchy(bs4, class_def):
     if class_def is None:
         return
 
-    # first item in the list will be the original class
-    hierarchy = []
-
-    # get the class' hierarchy
-    iter_class_base(class_def, hierarchy)
+    # get the class' hierarchy, starting with the root class
+    hierarchy = g_symbolMap.get_class_lineage(class_def.qualifiedName)
     hierarchy.append(class_def)
 
     if len(hierarchy) == 1:
@@ -1623,6 +2062,138 @@ def markup_description(bs4, tree):
     return description_el
 
 
+def markup_description_html(bs4, tree):
+    """
+    Generates the same html as str(markup_description(bs4, tree)), but writes it straight from the xml
+    :param bs4: BeautifulSoup instance, only used for markup that DescriptionWriter leaves to markup_description
+    :param tree: element with the briefdescription and detaileddescription
+    :return: tuple of the html string and whether the description has any text
+    """
+    writer = DescriptionWriter()
+    try:
+        return writer.write_description(tree), writer.has_text
+    except DescriptionWriter.Unsupported:
+        description_el = markup_description(bs4, tree)
+        return str(description_el), len(description_el.text) > 0
+
+
+class DescriptionWriter(object):
+    """
+    Converts doxygen description markup to html in a single walk over the xml, writing the html as text.
+    Follows what iterate_markup and replace_tag build in bs4 exactly, down to the attribute order and escaping of
+    str(tag), and raises Unsupported for the odd markup they don't handle gracefully.
+    """
+
+    # html tags, and the doxygen tags that get a span with their name as class
+    TAGS = {"linebreak": "br", "emphasis": "em", "ref": "a", "ulink": "a", "computeroutput": "code",
+            "includes": "span", "simplesect": "span", "para": "p"}
+    EMPTY_TAGS = frozenset(["br"])
+
+    class Unsupported(Exception):
+        pass
+
+    def __init__(self):
+        self.has_text = False
+
+    def write_description(self, tree):
+        parts = []
+        for desc in tree.findall(r'briefdescription/'):
+            self.write_element(desc, parts)
+        for desc in tree.findall(r'detaileddescription/'):
+            self.write_element(desc, parts)
+
+        html = u'<div class="description content">' + u"".join(parts) + u"</div>"
+        return html.encode("utf-8")
+
+    def write_text(self, parts, text):
+        if text:
+            self.has_text = True
+            parts.append(text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
+
+    def write_element(self, tree, parts, code_parts=None):
+        """
+        Writes the html of an element to the contents of its parent, and its tail after it
+        :param tree: doxygen element
+        :param parts: list of html strings of the parent's contents
+        :param code_parts: list of html strings of the parent's code tag, if it is a program listing
+        :return:
+        """
+        tag = tree.tag
+        attrib = tree.attrib
+        text = tree.text
+
+        # code lines go into the code tag of the program listing, their tails don't
+        target = parts
+        if tag == "codeline":
+            if code_parts is None:
+                raise self.Unsupported(tag)
+            target = code_parts
+
+        if tag == "sp":
+            if text is not None:
+                raise self.Unsupported(tag)
+            text = " "
+        elif tag == "computeroutput" and text:
+            text = text.strip()
+
+        attrs = []
+        tag_name = self.TAGS.get(tag)
+        if tag_name is None:
+            tag_name = "span"
+            attrs.append(("class", tag))
+        elif tag == "ref":
+            href = get_link_href(attrib)
+            if href is None:
+                raise self.Unsupported(tag)
+            attrs.append(("href", "../" + href))
+            attrs.append(("target", "_self"))
+        elif tag == "ulink":
+            if "url" not in attrib:
+                raise self.Unsupported(tag)
+            attrs.append(("href", attrib["url"]))
+            attrs.append(("target", "_blank"))
+
+        contents = []
+        if tag == "simplesect":
+            if "kind" not in attrib:
+                raise self.Unsupported(tag)
+            if attrib["kind"] == "see":
+                self.has_text = True
+                contents.append(u'<dt class="section see">See Also</dt>')
+            else:
+                contents.append(u'<dt class="section"></dt>')
+
+        child_code_parts = [] if tag == "programlisting" else None
+        self.write_text(contents if child_code_parts is None else child_code_parts, text)
+        for child in tree:
+            self.write_element(child, contents, child_code_parts)
+
+        open_tag = u"<" + tag_name + u"".join(u" " + name + u"=" + self.quote(value) for name, value in attrs)
+        if child_code_parts is not None:
+            contents.insert(0, u'<code class="language-cpp">' + u"".join(child_code_parts) + u"</code>")
+        if contents or tag_name not in self.EMPTY_TAGS:
+            target.append(open_tag + u">" + u"".join(contents) + u"</" + tag_name + u">")
+        else:
+            target.append(open_tag + u"/>")
+
+        if tree.tail is not None:
+            self.write_text(parts, tree.tail)
+            if tree.tail.endswith(";"):
+                parts.append(u"<br/>")
+
+    @staticmethod
+    def quote(value):
+        """
+        Escapes and quotes an attribute value like bs4 does
+        """
+        value = value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        if '"' not in value:
+            return u'"' + value + u'"'
+        if "'" not in value:
+            return u"'" + value + u"'"
+        return u'"' + value.replace('"', "&quot;") + u'"'
+
+
 def replace_code_chunks(bs4):
     """
     Looks though the html and replaces any code chunks that exist
@@ -1882,7 +2453,7 @@ def process_xml_file_definition(in_path, out_path, file_type):
         return
 
     if file_type == "class":
-        if any(in_path.find(blacklisted) > -1 for blacklisted in config.CLASS_LIST_BLACKLIST):
+        if config.is_class_blacklisted(in_path):
             log("Skipping file | Class " + in_path + " blacklisted", 0)
             return
 
@@ -1917,7 +2488,6 @@ def process_xml_file_definition(in_path, out_path, file_type):
     bs4 = render_template(html_template, file_content)
     content_dict = {
         "page_title": file_content["title"],
-        "main_content": get_body_content(bs4),
         "body_class": body_class,
         "section_namespace": "cinder",
         str("section_" + section): "true"}
@@ -1925,17 +2495,14 @@ def process_xml_file_definition(in_path, out_path, file_type):
     content_dict.update(docs_meta.copy())
 
     # render within main template
-    bs4 = render_template(os.path.join(TEMPLATE_PATH, "master-template.mustache"), content_dict)
-    # make sure all links are absolute
-    update_links_abs(bs4, TEMPLATE_PATH)
-
+    bs4 = render_master_template(bs4, content_dict)
     if not bs4:
         log("Skipping class due to something nasty. Bother Greg and try again some other time. Error rendering: " + in_path, 2)
         return
 
-    # print output
-    # update links in the template
-    update_links(bs4, TEMPLATE_PATH + "htmlContentTemplate.html", TEMPLATE_PATH, out_path)
+    # make all links absolute, and then relative to the out path
+    rewrite_links(bs4, [TEMPLATE_PATH], TEMPLATE_PATH + "htmlContentTemplate.html", TEMPLATE_PATH, out_path)
+    splice_shared_fragments(bs4, [TEMPLATE_PATH], TEMPLATE_PATH + "htmlContentTemplate.html", TEMPLATE_PATH, out_path)
 
     # replace any code chunks with <pre> tags, which is not possible on initial creation
     replace_code_chunks(bs4)
@@ -1991,14 +2558,10 @@ def parse_typedefs(bs4, tree, sections):
 
     if config.is_section_whitelisted(sections, "typedefs"):
         section_config = config.get_section_config(sections, "typedefs")
-        if section_config:
-            prefix_blacklist = section_config["prefix_blacklist"] if section_config.has_key("prefix_blacklist") else None
-        else:
-            prefix_blacklist = None
 
         for member in tree.findall(r"compounddef/sectiondef/[@kind='typedef']/memberdef/[@kind='typedef']"):
             member_name = member.find(r"name").text
-            if prefix_blacklist and any(member_name.startswith(blacklisted) > 0 for blacklisted in prefix_blacklist):
+            if config.is_prefix_blacklisted(section_config, member_name):
                 # skip this blacklisted typedef
                 continue
 
@@ -2078,7 +2641,7 @@ def fill_class_content(tree):
             log(e.message, 1)
 
     if not class_def:
-        log("NO CLASS OBJECT DEFINED FOR: " + class_name, 1)
+        log("NO CLASS OBJECT DEFINED FOR: " + class_name, 1, key="NO CLASS OBJECT DEFINED")
         # raise
         # return
 
@@ -2086,14 +2649,13 @@ def fill_class_content(tree):
     file_data.title = file_data.name
 
     # add namespace nav --------------------------------- #
-    file_data.namespace_nav = str(g_namespaceNav)
+    file_data.namespace_nav = get_shared_fragment_markup("namespace_nav")
 
     # page header --------------------------------------- #
     file_data.page_header = file_data.compoundName
 
     # add description ----------------------------------- #
-    description = markup_description(bs4, tree.find(r'compounddef'))
-    file_data.description = str(description) if description is not None else ""
+    file_data.description = markup_description_html(bs4, tree.find(r'compounddef'))[0]
 
     # includes ------------------------------------------ #
     include_link = None
@@ -2265,7 +2827,7 @@ def fill_namespace_content(tree):
     file_data.title = file_data.name
 
     # add namespace nav --------------------------------- #
-    file_data.namespace_nav = str(g_namespaceNav)
+    file_data.namespace_nav = get_shared_fragment_markup("namespace_nav")
 
     # add namespaces ------------------------------------ #
     file_data.namespaces = parse_namespaces(tree, sections)
@@ -2289,8 +2851,9 @@ def fill_namespace_content(tree):
     file_data.variables = parse_vars(bs4, tree, sections)
 
     # define search tags
+    # copied, since the namespace in the symbol map is fingerprinted by the pages that look it up
     if ns_def:
-        file_data.search_tags = ns_def.tags
+        file_data.search_tags = list(ns_def.tags)
     else:
         file_data.search_tags = []
 
@@ -2307,7 +2870,7 @@ def fill_group_content(tree, module_config):
     group_def = g_symbolMap.find_group(group_name)
 
     if not group_def:
-        log("NO CLASS OBJECT DEFINED FOR: " + group_name, 1)
+        log("NO CLASS OBJECT DEFINED FOR: " + group_name, 1, key="NO CLASS OBJECT DEFINED")
         # return
 
     # page title ---------------------------------------- #
@@ -2317,8 +2880,7 @@ def fill_group_content(tree, module_config):
     file_data.page_header = file_data.name
 
     # add description ----------------------------------- #
-    description = markup_description(bs4, tree.find(r'compounddef'))
-    file_data.description = str(description) if description is not None else ""
+    file_data.description = markup_description_html(bs4, tree.find(r'compounddef'))[0]
 
     # submodules ---------------------------------------- #
     subgroups = []
@@ -2379,8 +2941,7 @@ def process_html_file(in_path, out_path):
     - Copy original css and js links into new hmtl
     - Save html in destination dir
     """
-#    log_progress('Processing file: ' + str(in_path))
-    print 'Processing file: ' + str(in_path)
+    log_progress('Processing file: ' + str(in_path))
     # relative path in relation to the in_path (htmlsrc/)
     local_rel_path = os.path.relpath(in_path, HTML_SOURCE_PATH)
     # directory name of the path
@@ -2478,16 +3039,15 @@ def process_html_file(in_path, out_path):
     # render file template
     bs4 = render_template(template, file_content)
     update_links_abs(bs4, os.path.dirname(in_path))
-    content_dict = {'page_title': file_content["title"], 'main_content': get_body_content(bs4), 'body_class': body_class, str("section_" + section): "true"}
+    content_dict = {'page_title': file_content["title"], 'body_class': body_class, str("section_" + section): "true"}
     # append file meta
     content_dict.update(docs_meta.copy())
 
     # plug everything into the master template
-    bs4 = render_template(os.path.join(TEMPLATE_PATH, "master-template.mustache"), content_dict)
-    # make sure all links are absolute
-    update_links_abs(bs4, TEMPLATE_PATH)
-    # now all links shoul be relative to out path
-    update_links(bs4, TEMPLATE_PATH, in_path, out_path)
+    bs4 = render_master_template(bs4, content_dict)
+    # make sure all links are absolute, and then relative to the out path
+    rewrite_links(bs4, [TEMPLATE_PATH], TEMPLATE_PATH, in_path, out_path)
+    splice_shared_fragments(bs4, [TEMPLATE_PATH], TEMPLATE_PATH, in_path, out_path)
 
     if bs4 is None:
         log("Error generating file, so skipping: " + in_path, 2)
@@ -2579,6 +3139,10 @@ def generate_dynamic_markup(ref_data):
 
     # find template if it exists
 
+    # dynamic content is generated from the whole symbol map, so these pages are always regenerated
+    if state.build_record is not None:
+        state.build_record["volatile"] = True
+
     ref_id = ref_data["id"]
     if ref_id == "glm":
         return_markup = generate_glm_reference()
@@ -2660,6 +3224,9 @@ def generate_class_list_data():
 
 # ===================================================================================================== CI Tag Functions
 
+# ci tags that add to the symbol map, see scan_html_file
+CI_SCAN_PATTERN = re.compile(r"<ci\b[^>]*\b(seealso|prefix)\b", re.IGNORECASE)
+
 
 def process_ci_tag(bs4, tag, in_path, out_path):
     """
@@ -2699,7 +3266,7 @@ def replace_ci_tag(bs4, link, in_path, out_path):
         add_class_to_tag(new_link, "ci")
         link.replace_with(new_link)
     else:
-        log("Could not find replacement tag for ci tag: " + str(link), 1)
+        log("Could not find replacement tag for ci tag: " + str(link), 1, key="Could not find replacement tag for ci tag")
 
 
 def process_ci_seealso_tag(bs4, tag, out_path):
@@ -2724,14 +3291,14 @@ def process_ci_seealso_tag(bs4, tag, out_path):
 
     # if type(ref_obj) is SymbolMap.Class or type(ref_obj) is SymbolMap.Typedef:
     if type(ref_obj) is SymbolMap.Class:
-        ref_obj.add_related_link(link_data)
+        add_class_related_link(ref_obj, link_data)
 
     elif type(ref_obj) is SymbolMap.Namespace:
         # find all classes with that namespace and add guide to every one
         for class_obj in g_symbolMap.find_classes_in_namespace(ref_obj.name):
-            class_obj.add_related_link(link_data)
+            add_class_related_link(class_obj, link_data)
     else:
-        log("Could not find seealso reference for " + str(tag), 1)
+        log("Could not find seealso reference for " + str(tag), 1, key="Could not find seealso reference")
 
 
 def process_ci_prefix_tag(bs4, tag, in_path):
@@ -2764,7 +3331,62 @@ def process_ci_prefix_tag(bs4, tag, in_path):
             content = c.encode("utf-8", errors="replace")
             prefix_content += content
 
-        obj_ref.define_prefix(prefix_content)
+        define_class_prefix(obj_ref, prefix_content)
+
+
+def add_class_related_link(class_obj, link_data):
+    """
+    Adds a related link to a class and keeps track of it if the page is being processed in a worker process
+    :param class_obj: The SymbolMap.Class to add the link to
+    :param link_data: LinkData of the related page
+    :return:
+    """
+    class_obj.add_related_link(link_data)
+    # the link is recorded relative to the docs dir, since a skipped page replays it in the next build
+    link = os.path.relpath(link_data.link, BASE_PATH)
+    record_symbol_update(["related", class_obj.qualifiedName, link, link_data.label])
+
+
+def define_class_prefix(class_obj, prefix_content):
+    """
+    Defines the prefix content of a class and keeps track of it if the page is being processed in a worker process
+    :param class_obj: The SymbolMap.Class to define the prefix for
+    :param prefix_content: html string of the prefix
+    :return:
+    """
+    class_obj.define_prefix(prefix_content)
+    record_symbol_update(["prefix", class_obj.qualifiedName, prefix_content])
+
+
+def record_symbol_update(update):
+    """
+    Keeps track of a symbol map change made by the page being processed, so that it can be merged back from a worker
+    process or replayed when the page is skipped by an incremental build
+    :param update: list of [kind, qualified class name, values...]
+    :return:
+    """
+    if state.page_record is not None:
+        state.page_record["symbols"].append(update)
+    if state.build_record is not None:
+        state.build_record["symbols"].append(update)
+
+
+def apply_symbol_update(update):
+    """
+    Applies a symbol map change that was recorded while processing a page in another process
+    :param update: list of [kind, qualified class name, values...]
+    :return:
+    """
+    kind = update[0]
+    class_obj = g_symbolMap.classes.get(update[1])
+    if class_obj is None:
+        log("Could not apply " + kind + " to missing class " + update[1], 1, key="Could not apply to missing class")
+        return
+
+    if kind == "related":
+        class_obj.add_related_link(LinkData(os.path.join(BASE_PATH, update[2]).replace("\\", "/"), update[3]))
+    elif kind == "prefix":
+        class_obj.define_prefix(update[2])
 
 
 # TODO: add ability to replace ci tag with link to github source file
@@ -2835,6 +3457,174 @@ def find_ci_tag_ref(link):
 
 # ======================================================================================================== Link Updating
 
+# attribute that holds the url, by tag
+LINK_ATTRIBUTES = {"link": "href", "a": "href", "script": "src", "img": "src", "iframe": "src"}
+# number of resolved links that the path resolver keeps
+PATH_CACHE_SIZE = 10000
+
+
+class PathResolver(object):
+    """
+    Resolves the links of the generated pages. The master template alone adds the same few dozen links to every
+    page, so results are kept in an LRU cache keyed by the arguments that they were resolved with.
+    When the cache is full, the least recently used half of it is dropped at once, which keeps hits cheap.
+    """
+
+    def __init__(self, base_path, max_size=PATH_CACHE_SIZE):
+        self.base_path = base_path.replace('\\', '/')
+        # a max_size of 0 turns the cache off
+        self.max_size = max_size
+        # [result, last use] by key
+        self.results = {}
+        self.uses = 0
+        self.hits = 0
+        self.misses = 0
+
+        # path parts by path, for the handful of source and destination directories
+        self.path_parts = {}
+
+    def cached(self, key, resolve_fn, *args):
+        """
+        Returns the result for the key if it's cached, otherwise calls resolve_fn with args and caches its result
+        :param key: tuple of the arguments to resolve
+        :param resolve_fn: function that resolves them
+        :return: the result of resolve_fn
+        """
+        self.uses += 1
+        entry = self.results.get(key)
+        if entry is not None:
+            self.hits += 1
+            entry[1] = self.uses
+            return entry[0]
+
+        self.misses += 1
+        result = resolve_fn(*args)
+        if self.max_size > 0:
+            if len(self.results) >= self.max_size:
+                self.evict()
+            self.results[key] = [result, self.uses]
+        return result
+
+    def evict(self):
+        """
+        Drops the least recently used half of the cache
+        :return:
+        """
+        entries = sorted(self.results.iteritems(), key=lambda item: item[1][1])
+        for key, entry in entries[:len(entries) // 2 + 1]:
+            del self.results[key]
+
+    def split(self, path):
+        """
+        Splits a path with forward slashes into its non empty parts
+        :param path: directory path
+        :return: tuple of path parts
+        """
+        parts = self.path_parts.get(path)
+        if parts is None:
+            parts = self.path_parts[path] = tuple(filter(None, path.split('/')))
+        return parts
+
+    def resolve(self, link, abs_paths, template_path, save_path):
+        """
+        Resolves a url for rewrite_links. Results are shared by the pages in the same directory.
+        :param link: url to resolve
+        :param abs_paths: tuple of paths to make the url absolute against
+        :param template_path: path that the absolute url is relative to
+        :param save_path: path that the html will be saved to
+        :return: the new url
+        """
+        key = ("resolve", link, abs_paths, template_path, os.path.dirname(save_path) if save_path else None)
+        return self.cached(key, self.resolve_link, link, abs_paths, template_path, save_path)
+
+    def resolve_link(self, link, abs_paths, template_path, save_path):
+        for abs_path in abs_paths:
+            link = self.update_link_abs(link, abs_path)
+        if save_path:
+            link = self.update_link(link, template_path, save_path)
+        return link
+
+    def relative_url(self, in_path, link):
+        return self.cached(("relative_url", in_path, link), self.resolve_relative_url, in_path, link)
+
+    def resolve_relative_url(self, in_path, link):
+        index = 0
+        d = self.split(in_path.replace('\\', '/'))
+        s = filter(None, link.replace('\\', '/').split('/'))
+
+        # FIND largest substring match
+        for i, resource in enumerate(d):
+            if resource != s[i]:
+                break
+            index += 1
+
+        # remainder of source, after going back to the common directory
+        return "../" * (len(d) - index) + "/".join(s[index:])
+
+    def update_link_abs(self, link, in_path):
+        if link.startswith("http") or link.startswith("javascript:") or link.startswith("#"):
+            return link
+        return self.cached(("update_link_abs", link, in_path), self.resolve_link_abs, link, in_path)
+
+    def resolve_link_abs(self, link, in_path):
+        index = 0
+        backs = 0
+        # SPLIT the url into a list of path parts
+        r = self.split(in_path.replace('\\', '/'))
+        l = filter(None, link.split('/'))
+
+        # FIND largest substring match
+        for i, resource in enumerate(r):
+            if resource != l[i]:
+                break
+            index += 1
+
+        # FIND the amount of back references
+        for back_ref in l:
+            if back_ref != "..":
+                break
+            backs += 1
+
+        if not index:
+            if backs > 0:
+                return "/".join(r[:backs * -1]) + "/" + "/".join(l[backs:])
+            return "/".join(r) + "/" + "/".join(l)
+        return "/".join(r[:index]) + "/" + "/".join(l[index:])
+
+    def update_link(self, link, in_path, out_path):
+        if link.startswith("http") or link.startswith("javascript:") or link.startswith("#"):
+            return link
+        return self.cached(("update_link", link, in_path, out_path), self.resolve_update_link, link, in_path, out_path)
+
+    def resolve_update_link(self, link, in_path, out_path):
+        base_path = self.base_path
+        in_path = in_path.replace('\\', '/')
+        out_path = out_path.replace('\\', '/')
+        link = link.replace('\\', '/')
+
+        # if a relative path, make it absolute
+        if in_path.find(base_path) < 0:
+            in_path = base_path + in_path
+
+        # get absolute in path
+        abs_link_path = self.update_link_abs(link, in_path)
+
+        # convert to relative link in relation to the out path
+        src_base = in_path.split(base_path)[1].split('/')[0]        # likely htmlsrc
+        dest_base = out_path.split(base_path)[1].split('/')[0]      # htmlsrc or html
+
+        abs_dest = posixpath.dirname(out_path)
+        abs_link = abs_link_path.replace(src_base, dest_base)
+        return self.relative_url(abs_dest, abs_link)
+
+
+def get_path_resolver():
+    global g_path_resolver
+    if g_path_resolver is None:
+        g_path_resolver = PathResolver(BASE_PATH)
+    return g_path_resolver
+
+
 def path_join(path, link):
     p = path.replace('\\', '/')
     l = link.replace('\\', '/')
@@ -2859,69 +3649,99 @@ def update_links_abs(html, src_path):
     :param dest_path:
     :return:
     """
+    rewrite_links(html, [src_path])
 
-    # css links
-    for link in html.find_all("link"):
-        if link.has_attr("href"):
-            link["href"] = update_link_abs(link["href"], src_path)
 
-    # a links
-    for a in html.find_all("a"):
-        if a.has_attr("href"):
-            link_href = a["href"]
+def rewrite_links(html, abs_paths, template_path=None, src_path=None, save_path=None):
+    """
+    Rewrites the urls of all of the css links, a links, scripts, images and iframes in a single walk over the html.
+    Each url is made absolute against each of the abs_paths in turn, like update_links_abs does, and then relative
+    to save_path, like update_links does, if save_path is given.
+    :param html: BeautifulSoup instance
+    :param abs_paths: list of paths to make the urls absolute against
+    :param template_path: path that the absolute urls are relative to
+    :param src_path: path of the source file
+    :param save_path: path that the html will be saved to
+    :return:
+    """
+    if template_path is not None:
+        template_path = template_path.replace('\\', '/')
+    abs_paths = tuple(abs_paths)
 
-            # if the link is an hpp file, lets link to the github link since we likely don't have it in our docs
-            if link_href.find(config.GLM_MODULE_CONFIG["source_file_ext"]) > -1:
-                a["href"] = config.GLM_MODULE_CONFIG["url_prefix"] + a.text
-            else:
-                a["href"] = update_link_abs(a["href"], src_path)
-
-    # script links
-    for script in html.find_all("script"):
-        if script.has_attr("src"):
-            script["src"] = update_link_abs(script["src"], src_path)
-
-    # images
-    for img in html.find_all("img"):
-        if img.has_attr("src"):
-            img["src"] = update_link_abs(img["src"], src_path)
-
-    # iframes
-    for iframe in html.find_all("iframe"):
-        if iframe.has_attr("src"):
-            link_src = iframe["src"]
-            if link_src.startswith('javascript') or link_src.startswith('http'):
-                return
+    for tag in html.descendants:
+        if type(tag) is not Tag or tag.name not in LINK_ATTRIBUTES:
+            continue
+        attr = LINK_ATTRIBUTES[tag.name]
+        if not tag.has_attr(attr):
+            continue
 
-            new_link = update_link_abs(link_src, src_path)
-            iframe["src"] = new_link
+        if tag.name == "iframe":
+            update_iframe_link(tag, abs_paths, template_path, src_path, save_path)
+        # if the link is an hpp file, lets link to the github link since we likely don't have it in our docs
+        elif tag.name == "a" and tag[attr].find(config.GLM_MODULE_CONFIG["source_file_ext"]) > -1:
+            tag[attr] = config.GLM_MODULE_CONFIG["url_prefix"] + tag.text
+        else:
+            tag[attr] = get_path_resolver().resolve(tag[attr], abs_paths, template_path, save_path)
 
 
-def relative_url(in_path, link):
+def update_iframe_link(iframe, abs_paths, template_path, src_path, save_path):
     """
-    Generates a relative url from a absolute destination directory 
-    to an absolute file path
+    Rewrites the source of an iframe like rewrite_links does, and copies the file that it points to
+    next to the saved html
+    :param iframe: iframe Tag
+    :param abs_paths: tuple of paths to make the url absolute against
+    :param template_path: path that the absolute url is relative to
+    :param src_path: path of the source file
+    :param save_path: path that the html will be saved to
+    :return:
     """
+    for abs_path in abs_paths:
+        link_src = iframe["src"]
+        if not link_src.startswith('javascript') and not link_src.startswith('http'):
+            iframe["src"] = update_link_abs(link_src, abs_path)
 
-    index = 0
-    SEPARATOR = "/"
-    d = filter(None, in_path.replace('\\', SEPARATOR).split( SEPARATOR ))
-    s = filter(None, link.replace('\\', SEPARATOR).split( SEPARATOR ))
+    if not save_path:
+        return
 
-    # FIND largest substring match
-    for i, resource in enumerate( d ):
-        if resource != s[i]:
-            break
-        index += 1
+    link_src = iframe["src"]
 
-    # remainder of source
-    s = s[index:]
-    
-    backCount = len( d ) - index
+    # on osx/unix
+    if os.sep == "/":
+        if not posixpath.isabs(link_src):
+            link_src = "/" + link_src
+    if link_src.startswith('javascript') or link_src.startswith('http'):
+        return
 
-    path = "../" * backCount
-    path += SEPARATOR.join( s )
-    return path
+    # base dir
+    src_base = src_path.split(BASE_PATH)[1].split(os.sep)[0]
+    dest_base = save_path.split(BASE_PATH)[1].split(os.sep)[0]
+
+    # get link of iframe source and replace in iframe
+    new_link = update_link(link_src, template_path, save_path)
+    iframe["src"] = new_link
+
+    # define the paths of file to copy and where to copy to
+    src_file = link_src
+    dest_file = link_src.replace(src_base, dest_base)
+
+    try:
+        # copy file as long as the source and destination is not the same
+        if SM(None, src_file, dest_file).ratio() < 1.0:
+            shutil.copy2(src_file, dest_file)
+    except IOError as e:
+        log("Cannot copy src_file because it doesn't exist: " + src_file, 2)
+        log(e.strerror, 2)
+    except Exception as e:
+        log("Cannot copy iframe over because of some other error", 2)
+        log(e.strerror)
+
+
+def relative_url(in_path, link):
+    """
+    Generates a relative url from a absolute destination directory 
+    to an absolute file path
+    """
+    return get_path_resolver().relative_url(in_path, link)
 
 
 def update_link_abs(link, in_path):
@@ -2931,44 +3751,7 @@ def update_link_abs(link, in_path):
     :param in_path: the original path to the file that the link lives in
     :return:
     """
-
-    if link.startswith("http") or link.startswith("javascript:") or link.startswith("#"):
-        return link
-
-    SEPARATOR = "/"
-    in_path = in_path.replace('\\', SEPARATOR)
-
-    index = 0
-    backs = 0
-    # SPLIT the url into a list of path parts
-    r = in_path.split(SEPARATOR)
-    r = filter(None, r)
-    l = link.split(SEPARATOR)
-    l = filter(None, l)
-
-    # FIND largest substring match
-    for i, resource in enumerate( r ):
-        if resource != l[i]:
-            break
-        index += 1
-
-    # FIND the amount of back references
-    for j, back_ref in enumerate( l ):
-        if back_ref != "..":
-            break
-        backs += 1
-
-    if not index:
-        if backs > 0:
-            final = SEPARATOR.join(r[:backs*-1]) + SEPARATOR + SEPARATOR.join(l[backs:]) 
-        else:
-            final = SEPARATOR.join(r) + SEPARATOR + SEPARATOR.join(l)
-    else:
-        pre = r[:index]
-        post = l[index:]
-        final = SEPARATOR.join(pre) + SEPARATOR + SEPARATOR.join(post)
-
-    return final    
+    return get_path_resolver().update_link_abs(link, in_path)
 
 
 def update_links(html, template_path, src_path, save_path):
@@ -2979,72 +3762,7 @@ def update_links(html, template_path, src_path, save_path):
     :param dest_path:
     :return:
     """
-
-    template_path = "/".join(template_path.replace('\\', '/').split('/'))
-
-    # css links
-    for link in html.find_all("link"):
-        if link.has_attr("href"):
-            link["href"] = update_link(link["href"], template_path, save_path)
-
-    # a links
-    for a in html.find_all("a"):
-        if a.has_attr("href"):
-            link_href = a["href"]
-
-            # if the link is an hpp file, lets link to the github link since we likely don't have it in our docs
-            if link_href.find(config.GLM_MODULE_CONFIG["source_file_ext"]) > -1:
-                a["href"] = config.GLM_MODULE_CONFIG["url_prefix"] + a.text
-            else:
-                a["href"] = update_link(a["href"], template_path, save_path)
-
-    # script links
-    for script in html.find_all("script"):
-        if script.has_attr("src"):
-            script["src"] = update_link(script["src"], template_path, save_path)
-
-    # images
-    for img in html.find_all("img"):
-        if img.has_attr("src"):
-            img["src"] = update_link(img["src"], template_path, save_path)
-
-    # iframes
-    for iframe in html.find_all("iframe"):
-        if iframe.has_attr("src"):
-
-            link_src = iframe["src"]
-
-            # on osx/unix
-            if os.sep == "/":
-                if not posixpath.isabs(link_src):
-                    link_src = "/" + link_src
-            if link_src.startswith('javascript') or link_src.startswith('http'):
-                return
-
-            # base dir
-            src_base = src_path.split(BASE_PATH)[1].split(os.sep)[0]
-            dest_base = save_path.split(BASE_PATH)[1].split(os.sep)[0]
-
-            # get link of iframe source and replace in iframe
-            new_link = update_link(link_src, template_path, save_path)
-            iframe["src"] = new_link
-
-            # define the paths of file to copy and where to copy to
-            src_file = link_src
-            dest_file = link_src.replace(src_base, dest_base)
-
-            try:
-                # copy file as long as the source and destination is not the same
-                if SM(None, src_file, dest_file).ratio() < 1.0:
-                    shutil.copy2(src_file, dest_file)
-            except IOError as e:
-                log("Cannot copy src_file because it doesn't exist: " + src_file, 2)
-                log(e.strerror, 2)
-                return
-            except Exception as e:
-                log("Cannot copy iframe over because of some other error", 2)
-                log(e.strerror)
-                return
+    rewrite_links(html, [], template_path, src_path, save_path)
 
 
 def update_link(link, in_path, out_path):
@@ -3054,35 +3772,7 @@ def update_link(link, in_path, out_path):
     :param in_path: the original path to the file that the link lives in
     :return:
     """
-
-    if link.startswith("http") or link.startswith("javascript:") or link.startswith("#"):
-        return link
-
-    SEPARATOR = '/'
-    in_path = in_path.replace('\\', SEPARATOR)
-    out_path = out_path.replace('\\', SEPARATOR)
-    link = link.replace('\\', SEPARATOR)
-    base_path = BASE_PATH.replace('\\', SEPARATOR)
-
-    # if a relative path, make it absolute
-    if in_path.find(base_path) < 0:
-        in_path = base_path + in_path
-    
-    # get absolute in path
-    abs_link_path = update_link_abs(link, in_path)
-
-    # convert to relative link in relation to the out path
-    src_base = in_path.split(base_path)[1].split(SEPARATOR)[0]        # likely htmlsrc
-    dest_base = out_path.split(base_path)[1].split(SEPARATOR)[0]      # htmlsrc or html
-
-    abs_dest = posixpath.dirname(out_path).replace('\\', SEPARATOR)
-    abs_link = abs_link_path.replace(src_base, dest_base)
-    # if not posixpath.isabs(abs_link):
-        # abs_link = "/" + abs_link
-
-    rel_link_path = relative_url(abs_dest, abs_link)
-
-    return rel_link_path
+    return get_path_resolver().update_link(link, in_path, out_path)
 
 # =============================================================================================== File Utility Functions
 
@@ -3124,6 +3814,47 @@ def generate_bs4_from_string(string):
     return bs4
 
 
+def iter_tag_compounds(tag_path):
+    """
+    Streams the compounds of the doxygen tag file. Each compound is cleared once the caller is done with it, so the
+    tag file is never held in memory as a whole
+    :param tag_path: path of the tag file
+    :return: iterator of compound elements
+    """
+    context = ET.iterparse(tag_path, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event == "end" and elem.tag == "compound":
+            yield elem
+            # drop the compounds that have been handled
+            root.clear()
+
+
+def read_typedefs(typedefs):
+    """
+    Reads typedef members of the tag file for add_typedefs
+    :param typedefs: list of member elements
+    :return: list of (name, type, path) tuples
+    """
+    return [(t.find("name").text, t.find("type").text, t.find('anchorfile').text + "#" + t.find("anchor").text)
+            for t in typedefs]
+
+
+def read_enums(members, prefix):
+    """
+    Reads the enumeration members of a compound
+    :param members: list of member elements
+    :param prefix: scope to prepend to the enum names
+    :return: list of SymbolMap.Enum
+    """
+    enums = []
+    for member in members:
+        anchor = member.find("anchor").text
+        path = member.find("anchorfile").text + "#" + anchor
+        enums.append(SymbolMap.Enum(prefix + member.find("name").text, path))
+    return enums
+
+
 def get_symbol_to_file_map():
     """
     Returns a dictionary from Cinder class name to file path
@@ -3131,79 +3862,97 @@ def get_symbol_to_file_map():
     log("generating symbol map from tag file", 0, True)
     symbol_map = SymbolMap()
 
+    # classes go into the symbol map as they stream in. The other compounds are only read into symbol objects, and
+    # added once the stream is done, in the same order as before: structs, namespaces, files, then groups
+    structs = []
+    namespaces = []
+    files = []
+    groups = []
+    base_class = None
 
-    # find classes
-    class_tags = g_tag_xml.findall(r'compound/[@kind="class"]')
-    for c in class_tags:
-        class_obj = SymbolMap.Class(c)
-        name = class_obj.qualifiedName
-
-        # skip over blacklisted classes that belong to a blacklisted namespace
-        if any(name.find(blacklisted) > -1 for blacklisted in config.CLASS_LIST_BLACKLIST):
-            # print "SKIPPING " + name
-            continue
-
-        base_class = class_obj.base
-        symbol_map.classes[name] = class_obj
+    for compound in iter_tag_compounds(TAG_FILE_PATH):
+        kind = compound.get("kind")
 
-        # find functions and add to symbol map
-        members = c.findall(r"member[@kind='function']")
-        for member in members:
+        # find classes
+        if kind == "class":
+            class_obj = SymbolMap.Class(compound)
+            name = class_obj.qualifiedName
 
-            # function_obj = SymbolMap.Function(fn_name, base_class, args, file_path)
-            function_obj = SymbolMap.Function(member, base_class)
+            # skip over blacklisted classes that belong to a blacklisted namespace
+            if config.is_class_blacklisted(name):
+                # print "SKIPPING " + name
+                continue
 
-            # symbol_map.functions[name + "::" + function_obj.name] = function_obj
-            symbol_map.add_function(name, function_obj.name, function_obj)
-            class_obj.add_function(function_obj.name, function_obj)
+            base_class = class_obj.base
+            symbol_map.add_class(name, class_obj)
 
-        # print "CLASS: " + name
-        # if name == "Iter":
-        #     raise
+            # find functions and add to symbol map
+            for member in compound.findall(r"member[@kind='function']"):
+                function_obj = SymbolMap.Function(member, base_class)
+                symbol_map.add_function(name, function_obj.name, function_obj)
+                class_obj.add_function(function_obj.name, function_obj)
 
-        # find enums
-        for member in c.findall(r"member/[@kind='enumeration']"):
+            # find enums
             pre = name + "::" if name is not None else ""
-            enum_name = pre + member.find("name").text
-            anchor = member.find("anchor").text
-            path = member.find("anchorfile").text + "#" + anchor
-            enum_obj = SymbolMap.Enum(enum_name, path)
-            symbol_map.enums[enum_name] = enum_obj
+            for enum_obj in read_enums(compound.findall(r"member/[@kind='enumeration']"), pre):
+                symbol_map.enums[enum_obj.name] = enum_obj
+
+        elif kind == "struct":
+            struct_obj = SymbolMap.Class(compound)
+            functions = [SymbolMap.Function(member, struct_obj.base)
+                         for member in compound.findall(r"member[@kind='function']")]
+            structs.append((struct_obj, functions))
+
+        elif kind == "namespace":
+            name = compound.find('name').text
+            # functions get their base class once the structs are in
+            namespaces.append((name, compound.find('filename').text,
+                               read_typedefs(compound.findall(r"member/[@kind='typedef']")),
+                               read_enums(compound.findall(r"member/[@kind='enumeration']"), name + "::"),
+                               [SymbolMap.Function(member) for member in compound.findall(r"member[@kind='function']")]))
+
+        elif kind == "file":
+            name = compound.find('name').text
+            file_path = compound.find('path').text + name
+
+            # find typedefs for each file
+            typedefs = [SymbolMap.Typedef(td_name, type_name, type_path)
+                        for td_name, type_name, type_path in read_typedefs(compound.findall(r'member[@kind="typedef"]'))]
+
+            # find functions for each file
+            functions = [SymbolMap.Function(member, "") for member in compound.findall(r'member[@kind="function"]')]
+            files.append((SymbolMap.File(name, file_path, typedefs), functions))
+
+        elif kind == "group":
+            group_obj = SymbolMap.Group(compound)
+
+            # add subgroup names
+            for subgroup in compound.findall('subgroup'):
+                group_obj.subgroup_names.append(subgroup.text)
+
+            # hardcode this for now since all groups are part of glm
+            functions = [SymbolMap.Function(function, "glm") for function in compound.findall(r"member[@kind='function']")]
+            groups.append((group_obj, functions, read_typedefs(compound.findall(r"member/[@kind='typedef']"))))
 
     # find structs
-    struct_tags = g_tag_xml.findall(r'compound/[@kind="struct"]')
-    for s in struct_tags:
-        struct_obj = SymbolMap.Class(s)
+    for struct_obj, functions in structs:
         name = struct_obj.qualifiedName
         base_class = struct_obj.base
 
         # skip over blacklisted classes that belong to a blacklisted namespace
-        if any(name.find(blacklisted) > -1 for blacklisted in config.CLASS_LIST_BLACKLIST):
+        if config.is_class_blacklisted(name):
             log("SKIPPING " + name, 1)
             continue
 
-        symbol_map.classes[name] = struct_obj
+        symbol_map.add_class(name, struct_obj)
 
-        # find functions and add to symbol map
-        members = s.findall(r"member[@kind='function']")
-        for member in members:
-            # fn_name = member.find("name").text
-            # anchor = member.find("anchor").text
-            # file_path = member.find("anchorfile").text + "#" + anchor
-            # args = member.find("argsstring").text if member.find("argsstring") else ""
-            # function_obj = SymbolMap.Function(fn_name, base_class, args, file_path)
-            function_obj = SymbolMap.Function(member, base_class)
-            # symbol_map.functions[name + "::" + function_obj.name] = function_obj
+        # add functions to symbol map
+        for function_obj in functions:
             symbol_map.add_function(name, function_obj.name, function_obj)
             struct_obj.add_function(function_obj.name, function_obj)
 
     # find namespaces
-    ns_tags = g_tag_xml.findall(r'compound/[@kind="namespace"]')
-
-    for ns in ns_tags:
-        namespace_name = ns.find('name').text
-        file_name = ns.find('filename').text
-
+    for namespace_name, file_name, typedefs, enums, functions in namespaces:
         # skip namespaces with '@' in them
         if namespace_name.find('@') > -1:
             continue
@@ -3217,72 +3966,33 @@ def get_symbol_to_file_map():
         symbol_map.namespaces[namespace_name] = ns_obj
 
         # process all typedefs in namespace
-        typedef_list = add_typedefs(ns.findall(r"member/[@kind='typedef']"), namespace_name, symbol_map)
+        typedef_list = add_typedefs(typedefs, namespace_name, symbol_map)
         ns_obj.typedefs = typedef_list
 
         # find enums
-        for member in ns.findall(r"member/[@kind='enumeration']"):
-            name = namespace_name + "::" + member.find("name").text
-            # print "ENUM: " + name
-            anchor = member.find("anchor").text
-            path = member.find("anchorfile").text + "#" + anchor
-            enum_obj = SymbolMap.Enum(name, path)
-            symbol_map.enums[name] = enum_obj
+        for enum_obj in enums:
+            symbol_map.enums[enum_obj.name] = enum_obj
 
-        # find functions and add to symbol map
-        members = ns.findall(r"member[@kind='function']")
-        for member in members:
-            function_obj = SymbolMap.Function(member, base_class)
+        # add functions, with the base class of the last class or struct like before
+        for function_obj in functions:
+            function_obj.base = base_class
             ns_obj.functionList.append(function_obj)
             ns_obj.add_function(function_obj.name, function_obj)
 
     # find files
-    file_tags = g_tag_xml.findall(r'compound/[@kind="file"]')
-    for f in file_tags:
-        name = f.find('name').text
-        # filePath = f.find('path').text + f.find('filename').text
-        file_path = f.find('path').text + name
-        typedefs = []
-
-        # find typedefs for each file
-        for t in f.findall(r'member[@kind="typedef"]'):
-            td_name = t.find("name").text
-            type_name = t.find("type").text
-            type_path = t.find('anchorfile').text + "#" + t.find("anchor").text
-            typedef = SymbolMap.Typedef(td_name, type_name, type_path)
-            typedefs.append(typedef)
-
-        # print "FILE PATH: " + name + " | " + file_path
-        symbol_map.files[name] = SymbolMap.File(name, file_path, typedefs)
-
-        # find functions for each file
-        for member in f.findall(r'member[@kind="function"]'):
-            function_obj = SymbolMap.Function(member, "")
+    for file_obj, functions in files:
+        symbol_map.files[file_obj.name] = file_obj
+        for function_obj in functions:
             symbol_map.add_function("", function_obj.name, function_obj)
 
     # find groups
-    group_tags = g_tag_xml.findall(r'compound/[@kind="group"]')
-    for member in group_tags:
-        group_obj = SymbolMap.Group(member)
-        subgroups = member.findall('subgroup')
-
-        # hardcode this for now since all groups are part of glm
-        ns = "glm"
-
-        # add subgroup names
-        if len(subgroups) > 0:
-            for subgroup in subgroups:
-                group_obj.subgroup_names.append(subgroup.text)
-
+    for group_obj, functions, typedefs in groups:
         # find functions and add to symbol map
-        functions = member.findall(r"member[@kind='function']")
-        for function in functions:
-            function_obj = SymbolMap.Function(function, ns)
+        for function_obj in functions:
             group_obj.add_function(function_obj.name, function_obj)
-            symbol_map.add_function(ns, function_obj.name, function_obj)
+            symbol_map.add_function("glm", function_obj.name, function_obj)
 
         # find typedefs
-        typedefs = member.findall(r"member/[@kind='typedef']")
         add_typedefs(typedefs, "glm", symbol_map)
 
         symbol_map.groups[group_obj.name] = group_obj
@@ -3296,18 +4006,26 @@ def get_symbol_to_file_map():
                 subgroup = symbol_map.find_group(subgroup_name)
                 group_obj.subgroups.append(subgroup)
 
-    if len(file_tags) == 0:
+    if len(files) == 0:
         log("no compound of type 'file' found in tag file. Check doxygen SHOW_FILES setting.", 1)
 
+    # namespace functions are added without going through the symbol map
+    symbol_map.symbols_changed()
+    symbol_map.build_class_graph()
     return symbol_map
 
 
 def add_typedefs(typedefs, ns_name, symbol_map):
+    """
+    Adds typedefs to the symbol map, linking them to the classes they are shared pointers of
+    :param typedefs: list of (name, type, path) tuples from read_typedefs
+    :param ns_name: namespace of the typedefs
+    :param symbol_map: SymbolMap to add them to
+    :return: list of SymbolMap.Typedef
+    """
     typedef_list = []
     # if ns_name == "cinder::gl"
-    for typdef in typedefs:
-        name = typdef.find("name").text
-        type_name = typdef.find("type").text
+    for name, type_name, file_path in typedefs:
         full_name = ns_name + "::" + name
         shared_from_class = None
 
@@ -3330,7 +4048,6 @@ def add_typedefs(typedefs, ns_name, symbol_map):
             shareds = re.findall(r"([A-Za-z0-9]*)", type_name)
             shared_from_class = symbol_map.find_class(shareds[0])
 
-        file_path = typdef.find('anchorfile').text + "#" + typdef.find("anchor").text
         type_def_obj = SymbolMap.Typedef(name, type_name, file_path)
 
         if shared_from_class is not None and type(shared_from_class) == SymbolMap.Class:
@@ -3339,7 +4056,7 @@ def add_typedefs(typedefs, ns_name, symbol_map):
             # let the class know that it has some typedefs associated with it
             shared_from_class.add_type_def(type_def_obj)
 
-        symbol_map.typedefs[full_name] = type_def_obj
+        symbol_map.add_typedef(full_name, type_def_obj)
         typedef_list.append(type_def_obj)
     return typedef_list
 
@@ -3366,10 +4083,16 @@ def parse_xml(in_path):
     tree = None
     try:
         with open(in_path, "rb") as xml_file:
-            content = xml_file.read().decode("utf-8", errors="replace")
-            new_content = content.encode("utf-8", errors="replace")
+            content = xml_file.read()
+        try:
+            tree = ET.fromstring(content)
+        except ET.ParseError:
+            # retry with any bytes that aren't utf-8 replaced
+            content = content.decode("utf-8", errors="replace").encode("utf-8")
+            # cElementTree's fromstring doesn't take a parser, so feed it directly
             parser = ET.XMLParser(encoding="utf-8")
-            tree = ET.fromstring(new_content, parser)
+            parser.feed(content)
+            tree = parser.close()
 
     except:
         exc = sys.exc_info()[0]
@@ -3403,23 +4126,153 @@ def write_html(bs4, save_path):
             except Exception as e:
                 log("Writing HTML | " + str(e), 2)
 
-    # enode bs4, decode, and then re-encode and write
-    document = bs4.encode(formatter="html")
-    document = codecs.decode(document, "utf-8", "xmlcharrefreplace")
-
     if not os.path.exists(os.path.dirname(save_path)):
         os.makedirs(os.path.dirname(save_path))
+    # write the document in pieces rather than serializing all of it at once
     with codecs.open(save_path, "w", "utf-8") as outFile:
-        outFile.write(document)
+        for chunk in iter_html(bs4):
+            outFile.write(chunk)
+
+    if state.build_record is not None:
+        state.build_record["output"] = os.path.relpath(save_path, BASE_PATH)
+
+def iter_html(element, split_tags=("html", "head", "body")):
+    """
+    Serializes the contents of an element in chunks. The tags in split_tags are broken up into their start tag,
+    the chunks of their contents and their end tag, everything else is serialized whole.
+    :param element: BeautifulSoup instance or Tag
+    :param split_tags: names of the tags to break up
+    :return: generator of unicode strings
+    """
+    for child in element.contents:
+        if type(child) is not Tag:
+            yield child.output_ready(formatter="html")
+        elif child.name not in split_tags or not child.contents:
+            yield child.decode(formatter="html")
+        else:
+            # serialize the tag without its contents to get the start tag
+            contents = child.contents
+            child.contents = []
+            end_tag = "</%s>" % child.name
+            start_tag = child.decode(formatter="html")[:-len(end_tag)]
+            child.contents = contents
+
+            yield start_tag
+            for chunk in iter_html(child, split_tags):
+                yield chunk
+            yield end_tag
+
+
+def get_search_shard(entry):
+    """
+    Picks the shard of the search index that an entry goes into
+    :param entry: search index entry
+    :return: shard name
+    """
+    # doxygen groups are only used for the glm modules
+    if entry["type"] == "module" or GLM_LINK.search(entry["link"]):
+        return "glm"
+    if entry["type"] in ("class", "struct"):
+        return "classes"
+    if entry["type"] == "namespace":
+        return "namespaces"
+    return "guides"
+
+
+def compact_number(value):
+    """
+    Drops the fraction of whole numbers, so they serialize without the trailing .0
+    """
+    return int(value) if value == int(value) else value
+
+
+def build_search_shards(entries):
+    """
+    Splits the search entries into shards with a prebuilt lunr index each. Titles, links and index terms are stored
+    once in a string table shared by all shards and referenced by their position in it, and page types by their
+    position in the types list.
+    :param entries: list of search index entries
+    :return: tuple of the index header, the string table and a dict of shard data per shard name
+    """
+    strings = []
+    string_ids = {}
+
+    def get_string_id(value):
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    types = sorted(set(entry["type"] for entry in entries))
+    type_codes = dict((search_type, code) for code, search_type in enumerate(types))
+
+    shard_entries = dict((name, []) for name in SEARCH_INDEX_SHARDS)
+    for entry in entries:
+        shard_entries[get_search_shard(entry)].append(entry)
+
+    shards = {}
+    for name in SEARCH_INDEX_SHARDS:
+        index = LunrIndex(SEARCH_INDEX_FIELDS, "id")
+        positions = {}
+        rows = []
+        for entry in shard_entries[name]:
+            index.add(entry)
+            positions[entry["id"]] = len(rows)
+            rows.append([entry["id"], get_string_id(entry["title"]), get_string_id(entry["link"]),
+                         type_codes[entry["type"]]])
+
+        # each term row is the term's string id followed by pairs of entry position and term frequency
+        terms = []
+        for token, postings in index.iter_postings():
+            row = [get_string_id(token)]
+            for ref, tf in postings:
+                row.append(positions[ref])
+                row.append(compact_number(tf))
+            terms.append(row)
+
+        shards[name] = {"entries": rows, "terms": terms}
+
+    header = {
+        "version": 2,
+        "types": types,
+        "fields": [{"name": field, "boost": boost} for field, boost in SEARCH_INDEX_FIELDS],
+        "pipeline": LUNR_PIPELINE,
+        "strings": SEARCH_INDEX_DIR + "/strings.js",
+        "shards": [SEARCH_INDEX_DIR + "/" + name + ".js" for name in SEARCH_INDEX_SHARDS],
+        "data": []
+    }
+    return header, strings, shards
+
+
+def write_search_script(path, script):
+    """
+    Writes a script of the search index to the html dir
+    :param path: path relative to the html dir
+    :param script: javascript source
+    """
+    out_path = HTML_DEST_PATH + path
+    if not os.path.exists(os.path.dirname(out_path)):
+        os.makedirs(os.path.dirname(out_path))
+    with codecs.open(out_path, "w", "UTF-8") as outFile:
+        outFile.write(script)
+
+
+def to_compact_json(value):
+    """
+    Serializes the value to json without the whitespace between items
+    """
+    return json.dumps(value, separators=(",", ":")).encode('utf-8')
+
 
 def write_search_index():
-    # save search index to js file
-    document = "var search_index_data = " + json.dumps(g_search_index).encode('utf-8')
-    # print document
-    if not os.path.exists(os.path.dirname(HTML_DEST_PATH + 'search_index.js')):
-        os.makedirs(os.path.dirname(HTML_DEST_PATH + 'search_index.js'))
-    with codecs.open(HTML_DEST_PATH + 'search_index.js', "w", "UTF-8") as outFile:
-        outFile.write(document)
+    # save search index to js files; search_index.js is loaded by every page, the string table and the shards only
+    # once the search is used
+    header, strings, shards = build_search_shards(g_search_index["data"] if g_search_index else [])
+    write_search_script("search_index.js", "var search_index_data = " + to_compact_json(header))
+    write_search_script(header["strings"], "cinderSearch.addStrings(" + to_compact_json(strings) + ");")
+    for name in SEARCH_INDEX_SHARDS:
+        write_search_script(SEARCH_INDEX_DIR + "/" + name + ".js",
+                            "cinderSearch.addShard(" + to_compact_json(shards[name]) + ");")
 
 def add_to_search_index(html, save_path, search_type, tags=[]):
     """
@@ -3430,19 +4283,41 @@ def add_to_search_index(html, save_path, search_type, tags=[]):
     :param tags:
     :return:
     """
+    # creates new list from tags minus any dupes
+    search_list = list(set(tags))
+
+    title = html.head.find("title").text if html.head.find("title") else ""
+    search_entry = [title, save_path, search_list, search_type]
+
+    if state.build_record is not None:
+        state.build_record["search"].append(search_entry)
+
+    # worker processes hand their entries back to the parent, which numbers them
+    if state.page_record is not None:
+        state.page_record["search"].append(search_entry)
+    else:
+        append_search_index(*search_entry)
+
+
+def append_search_index(title, link, tags, search_type):
+    """
+    Numbers a page and appends it to the search index
+    :param title: title of the page
+    :param link: path of the page relative to the html dir
+    :param tags: list of search tags
+    :param search_type: type of page
+    :return:
+    """
     global g_search_index
     if not g_search_index:
         g_search_index = {"data": []}
 
-    # creates new list from tags minus any dupes
-    search_list = list(set(tags))
-
     search_obj = {"id": None, "title": None, "tags": []}
-    search_obj["id"] = len(g_search_index["data"])
-    search_obj["title"] = html.head.find("title").text if html.head.find("title") else ""
-    search_obj["link"] = save_path
-    search_obj["tags"] = search_list
+    search_obj["title"] = title
+    search_obj["link"] = link
+    search_obj["tags"] = tags
     search_obj["type"] = search_type
+    search_obj["id"] = len(g_search_index["data"])
     g_search_index["data"].append(search_obj)
 
 
@@ -3459,12 +4334,17 @@ def render_template(path, content):
     # output = renderer.render_path(path, content)
 
 
+    record_template(path)
+
     # print content
     # print path
     # step 1: render content in template
-    content_renderer = Renderer(file_encoding="utf-8", string_encoding="utf-8", decode_errors="xmlcharrefreplace")
-    content_renderer.search_dirs.append(TEMPLATE_PATH)
-    output = content_renderer.render_path(path, content)
+    global g_template_cache
+    if g_template_cache is None:
+        g_template_cache = TemplateCache([os.curdir, TEMPLATE_PATH])
+        if args.record_contexts:
+            g_template_cache.recorded_contexts = {}
+    output = g_template_cache.render(path, content)
 
     # step 2: place rendered content into main template
     # - should have the following custom partials:
@@ -3496,6 +4376,97 @@ def render_template(path, content):
     return bs4
 
 
+def render_master_template(page_bs4, content):
+    """
+    Renders the master template around a rendered page. Rather than serializing the page body into the
+    master template and parsing the result again, the master template is rendered around a placeholder
+    and the parsed page body is moved into its place.
+    :param page_bs4: BeautifulSoup instance of the rendered page template
+    :param content: master template content, minus the main content
+    :return: BeautifulSoup instance of the whole page
+    """
+    content["main_content"] = "<%s></%s>" % (MAIN_CONTENT_PLACEHOLDER, MAIN_CONTENT_PLACEHOLDER)
+    bs4 = render_template(os.path.join(TEMPLATE_PATH, "master-template.mustache"), content)
+
+    placeholder = bs4.find(MAIN_CONTENT_PLACEHOLDER)
+    before = placeholder.previous_sibling
+    after = placeholder.next_sibling
+    for element in list(page_bs4.body.contents):
+        # comments come out of get_body_content padded with a space, keep them that way
+        if type(element) is Comment:
+            element = bs4.new_string(" " + element, Comment)
+        placeholder.insert_before(element)
+    placeholder.decompose()
+
+    # join the text on either side of the page content, as if it had been parsed with the master template
+    if before is not None:
+        join_strings(before, before.next_sibling)
+    if after is not None:
+        join_strings(after.previous_sibling, after)
+    return bs4
+
+
+def join_strings(first, second):
+    """
+    Joins two adjacent strings into one. Like the parser does, a string of only whitespace is collapsed
+    into a single newline or space.
+    :param first: NavigableString
+    :param second: NavigableString that follows it
+    :return:
+    """
+    if type(first) is not NavigableString or type(second) is not NavigableString:
+        return
+
+    text = first + second
+    if not text.strip():
+        text = "\n" if "\n" in text else " "
+    first.replace_with(text)
+    second.extract()
+
+
+def get_shared_fragment_markup(name):
+    """
+    Markup to pass to a template in place of a shared fragment, see splice_shared_fragments
+    :param name: name of the fragment
+    :return: placeholder markup
+    """
+    return '<%s name="%s"></%s>' % (SHARED_FRAGMENT_PLACEHOLDER, name, SHARED_FRAGMENT_PLACEHOLDER)
+
+
+def get_shared_fragment_source(name):
+    """
+    Markup of a shared fragment, before its links are rewritten
+    :param name: name of the fragment
+    :return: string
+    """
+    if name == "namespace_nav":
+        return str(g_namespaceNav)
+    raise ValueError("Unknown shared fragment: " + name)
+
+
+def splice_shared_fragments(bs4, abs_paths, template_path, src_path, save_path):
+    """
+    Replaces the shared fragment placeholders of a page with the fragments. Fragments like the namespace nav are the
+    same on every page, so each one is parsed, has its links rewritten like rewrite_links does and is serialized once
+    per destination directory. The page passes that follow don't see its elements.
+    :param bs4: BeautifulSoup instance of the page
+    :param abs_paths: list of paths to make the urls absolute against
+    :param template_path: path that the absolute urls are relative to
+    :param src_path: path of the source file
+    :param save_path: path that the html will be saved to
+    :return:
+    """
+    for placeholder in bs4.find_all(SHARED_FRAGMENT_PLACEHOLDER):
+        name = placeholder["name"]
+        key = (name, tuple(abs_paths), template_path, os.path.dirname(save_path))
+        markup = g_shared_fragments.get(key)
+        if markup is None:
+            fragment_bs4 = generate_bs4_from_string(get_shared_fragment_source(name))
+            rewrite_links(fragment_bs4, abs_paths, template_path, src_path, save_path)
+            markup = g_shared_fragments[key] = "".join(iter_html(fragment_bs4.body))
+        placeholder.replace_with(bs4.new_string(markup, RawHtml))
+
+
 def get_file_type(file_prefix):
     """
     Determines the file type based on the file prefix
@@ -3564,7 +4535,7 @@ def process_file(in_path, out_path=None):
 
     if is_html_file:
         # print "process: " + HTML_SOURCE_PATH + file_path
-        process_html_file(HTML_SOURCE_PATH + file_path, save_path)
+        generate_page(process_html_file, HTML_SOURCE_PATH + file_path, save_path)
 
     elif is_xml_file:
         file_type = get_file_type(file_prefix)
@@ -3572,7 +4543,7 @@ def process_file(in_path, out_path=None):
         if not state.processed_html_files and not args.skiphtml:
             process_html_dir(HTML_SOURCE_PATH)
 
-        process_xml_file_definition(in_path, os.path.join(HTML_DEST_PATH, save_path), file_type)
+        generate_page(process_xml_file_definition, in_path, os.path.join(HTML_DEST_PATH, save_path), file_type)
 
 
 def process_dir(in_path, out_path):
@@ -3584,20 +4555,45 @@ def process_dir(in_path, out_path):
             outPath: The directory to save the generated html file to
     """
 
+    file_paths = []
     for file_path in os.listdir(in_path):
         full_path = os.path.join(in_path, file_path)
         # if file_path.endswith(".xml"):
 
         if os.path.isfile(full_path):
-            process_file(full_path)
+            file_paths.append(full_path)
 
         elif os.path.isdir(full_path):
+            process_files(file_paths)
+            file_paths = []
             process_html_dir(full_path)
 
+    process_files(file_paths)
+
 
 def process_html_dir(in_path):
     global state
 
+    with profile_phase("html guides"):
+        process_html_files(in_path)
+
+    # add subnav for all guides that need them
+    # process_sub_nav()
+
+    state.processed_html_files = True
+
+
+def process_html_files(in_path):
+    process_files(get_html_files(in_path))
+
+
+def get_html_files(in_path):
+    """
+    Lists the html files of a directory and its subdirectories, apart from the templates and assets
+    :param in_path: The directory to search
+    :return: list of html file paths
+    """
+    file_paths = []
     for path, subdirs, files in os.walk(in_path):
         path_dir = path.split(os.sep)[-1]
         if path_dir == "_templates" or path_dir == "assets":
@@ -3613,31 +4609,722 @@ def process_html_dir(in_path):
                     src_path = path
 
                 src_path = src_path + os.sep + name
-                process_file(src_path)
+                file_paths.append(src_path)
 
-    # add subnav for all guides that need them
-    # process_sub_nav()
+    return file_paths
+
+
+def scan_html_dir(in_path):
+    """
+    Applies what the guides add to the symbol map, their related links and class prefixes, without generating them.
+    This is all that a class or namespace page needs from the guides when it is generated on its own.
+    :param in_path: The html source directory
+    :return:
+    """
+    global state
+
+    with profile_phase("html guide scan"):
+        for file_path in get_html_files(in_path):
+            scan_html_file(file_path)
 
     state.processed_html_files = True
 
 
+def scan_html_file(in_path):
+    """
+    Processes the seealso and prefix ci tags of an html file the way process_html_file does, in the same order
+    :param in_path: The html file to scan
+    :return:
+    """
+    # same paths as process_file passes to process_html_file
+    file_path = os.sep.join(in_path.split('htmlsrc' + os.sep)[1:])
+    in_path = HTML_SOURCE_PATH + file_path
+    out_path = HTML_DEST_PATH + file_path
+
+    in_dir = os.path.dirname(in_path)
+    in_file_name = os.path.basename(in_path)
+    if in_file_name.startswith("_"):
+        return
+
+    config_data = parse_config(in_dir, in_file_name)
+    see_also_tags = config_data.see_also_tags if config_data and config_data.order == 0 else []
+
+    # most guides don't have any of these tags, so skip parsing them
+    with open(in_path, "rb") as html_file:
+        content = html_file.read()
+    if not see_also_tags and not CI_SCAN_PATTERN.search(content):
+        return
+
+    orig_html = generate_bs4(in_path)
+    if orig_html is None:
+        return
+
+    for script in orig_html.find_all("script"):
+        script.extract()
+
+    # the generated page has the ci tags of the head first, followed by the config's seealso tags and then the ones
+    # of the body
+    tags = []
+    if orig_html.head:
+        tags.extend(orig_html.head.find_all("ci"))
+        for dox in see_also_tags:
+            ci_tag = gen_tag(orig_html, "ci")
+            ci_tag.attrs["seealso"] = ""
+            ci_tag.attrs["label"] = config_data.see_also_label
+            ci_tag.attrs["dox"] = dox
+            tags.append(ci_tag)
+    if orig_html.body:
+        tags.extend(orig_html.body.find_all("ci"))
+
+    for tag in tags:
+        if tag.has_attr("seealso"):
+            process_ci_seealso_tag(orig_html, tag, out_path)
+        elif tag.has_attr("prefix"):
+            # links in the generated page are already relative to its save path when the prefix is read
+            update_links_abs(tag, in_dir)
+            rewrite_links(tag, [TEMPLATE_PATH], TEMPLATE_PATH, in_path, out_path)
+            process_ci_prefix_tag(orig_html, tag, in_path)
+
+
+def get_job_count():
+    """
+    Number of worker processes to generate pages with, as requested by the --jobs argument
+    :return: int
+    """
+    jobs = args.jobs if args.jobs > 0 else multiprocessing.cpu_count()
+
+    # contexts are recorded by the template cache of the main process
+    if jobs > 1 and args.record_contexts:
+        log("--record-contexts processes files one at a time", 1, True)
+        args.jobs = jobs = 1
+
+    # workers rely on inheriting the symbol map and namespace nav when they are forked
+    if jobs > 1 and not hasattr(os, "fork"):
+        log("--jobs requires a platform that supports fork, processing files one at a time", 1, True)
+        args.jobs = jobs = 1
+    return jobs
+
+
+def process_files(file_paths):
+    """
+    Processes a list of files in order, spreading them across a pool of worker processes if --jobs is set.
+    Anything that the pages add to the symbol map or the search index is merged back in the same order
+    as a serial run would have added it.
+    :param file_paths: list of html or xml files to process
+    :return:
+    """
+    jobs = get_job_count()
+    if jobs < 2 or len(file_paths) < 2:
+        for file_path in file_paths:
+            process_file(file_path)
+        return
+
+    # guides add related links and prefixes to classes, so they need to be merged in before the workers
+    # for the xml files are forked
+    has_xml_files = any(get_file_extension(file_path).lower() == ".xml" for file_path in file_paths)
+    if has_xml_files and not state.processed_html_files and not args.skiphtml:
+        process_html_dir(HTML_SOURCE_PATH)
+
+    pool = multiprocessing.Pool(min(jobs, len(file_paths)))
+    try:
+        for page_record in pool.imap(process_file_job, file_paths):
+            merge_page_record(page_record)
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def process_file_job(in_path):
+    """
+    Processes a file in a worker process
+    :param in_path: The file to process
+    :return: dict of the search index entries and symbol map changes made by the page
+    """
+    state.page_record = {"search": [], "symbols": [], "members": [], "build": None, "profile": None, "log": None}
+    logger.start_capture()
+    if g_profiler is not None:
+        # drop the records the worker inherited from the parent process when it was forked
+        g_profiler.take_records()
+    try:
+        process_file(in_path)
+        if g_profiler is not None:
+            state.page_record["profile"] = g_profiler.take_records()
+        return state.page_record
+    finally:
+        state.page_record["log"] = logger.stop_capture()
+        state.page_record = None
+
+
+def merge_page_record(page_record):
+    """
+    Merges the side effects of a page processed in a worker process back into this process
+    :param page_record: dict returned by process_file_job
+    :return:
+    """
+    logger.replay(page_record["log"])
+
+    for update in page_record["symbols"]:
+        apply_symbol_update(update)
+
+    for member_id, markup in page_record["members"]:
+        g_member_cache.add(member_id, markup)
+
+    for search_entry in page_record["search"]:
+        append_search_index(*search_entry)
+
+    if page_record["build"] is not None:
+        add_build_record(page_record["build"])
+
+    if page_record["profile"] is not None:
+        g_profiler.merge_records(page_record["profile"])
+
+
+# ===================================================================================================== Symbol Map Cache
+
+SYMBOL_MAP_CACHE_VERSION = 2
+SYMBOL_MAP_CACHE_PATH = HTML_DEST_PATH + ".symbol_map_cache"
+
+
+def get_symbol_map():
+    """
+    Loads the symbol map that a previous run built from the same tag file, or builds it from the tag file and caches it
+    :return: SymbolMap
+    """
+    symbol_map = None if args.full else load_symbol_map()
+    if symbol_map is None:
+        symbol_map = get_symbol_to_file_map()
+        save_symbol_map(symbol_map)
+    return symbol_map
+
+
+def get_symbol_map_key():
+    """
+    Hash of everything that goes into the symbol map
+    :return: string
+    """
+    parts = [
+        str(hash_file(TAG_FILE_PATH)),
+        str(hash_file(os.path.realpath(__file__))),
+        json.dumps(dict((key, value) for key, value in vars(config).items() if not key.startswith("_")),
+                   sort_keys=True),
+        BASE_PATH
+    ]
+    return hashlib.md5("\n".join(parts)).hexdigest()
+
+
+def load_symbol_map():
+    """
+    Loads the cached symbol map, if the tag file and config it was built from are unchanged
+    :return: SymbolMap or None
+    """
+    if not os.path.exists(SYMBOL_MAP_CACHE_PATH):
+        return None
+
+    try:
+        with open(SYMBOL_MAP_CACHE_PATH, "rb") as cache_file:
+            header = pickle.load(cache_file)
+            if header.get("version") != SYMBOL_MAP_CACHE_VERSION or header.get("key") != get_symbol_map_key():
+                return None
+            # the map is hundreds of thousands of small objects, which would trigger a lot of pointless collections
+            gc.disable()
+            try:
+                symbol_map = pickle.load(cache_file)
+            finally:
+                gc.enable()
+    except Exception as e:
+        log("Symbol map cache is unreadable, rebuilding it: " + str(e), 1, True)
+        return None
+
+    log("loaded symbol map from " + SYMBOL_MAP_CACHE_PATH, 0, True)
+    return symbol_map
+
+
+def save_symbol_map(symbol_map):
+    """
+    Caches the symbol map for the next runs. It has to be saved before any page adds to it
+    :param symbol_map: SymbolMap built from the tag file
+    """
+    header = {"version": SYMBOL_MAP_CACHE_VERSION, "key": get_symbol_map_key()}
+
+    if not os.path.exists(os.path.dirname(SYMBOL_MAP_CACHE_PATH)):
+        os.makedirs(os.path.dirname(SYMBOL_MAP_CACHE_PATH))
+
+    def write_cache(cache_file):
+        pickle.dump(header, cache_file, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(symbol_map, cache_file, pickle.HIGHEST_PROTOCOL)
+
+    write_file_atomically(SYMBOL_MAP_CACHE_PATH, write_cache)
+
+
+def reduce_symbol(symbol):
+    # the symbol classes are nested in SymbolMap, where pickle can't find them by name. The state is pickled after
+    # the instance is created, so that symbols can refer to each other. Fields that are computed on demand are
+    # left out, they are computed from the sources of the run that uses the map
+    state = dict((key, None if key.startswith("_") else value) for key, value in vars(symbol).iteritems())
+    return new_symbol, (type(symbol).__name__,), state
+
+
+def new_symbol(class_name):
+    symbol_class = getattr(SymbolMap, class_name)
+    return symbol_class.__new__(symbol_class)
+
+
+for symbol_class in (SymbolMap.Class, SymbolMap.Namespace, SymbolMap.Typedef, SymbolMap.Function, SymbolMap.File,
+                     SymbolMap.Enum, SymbolMap.Group):
+    copy_reg.pickle(symbol_class, reduce_symbol)
+
+
 # def copyFiles( HTML_SOURCE_PATH, DOXYGEN_HTML_PATH ):
+# ======================================================================================================= Build Manifest
+
+BUILD_MANIFEST_VERSION = 1
+BUILD_MANIFEST_PATH = HTML_DEST_PATH + ".build_manifest.json"
+# member markup of the build, saved along with the manifest
+MEMBER_CACHE_PATH = HTML_DEST_PATH + ".member_cache"
+# symbol fields that guides fill in, which only the reference pages read
+GUIDE_SYMBOL_FIELDS = ("relatedLinks", "prefix_content")
+
+
+def load_build_manifest():
+    """
+    Loads the manifest of the previous build. Pages are only skipped if everything they have in common, such as this
+    script, the docs meta data and the namespace nav, is unchanged since the previous build
+    :return: dict with the previous page records and the page records of this build
+    """
+    manifest = {"key": get_build_key(), "previous": {}, "pages": {}}
+    if args.full or not os.path.exists(BUILD_MANIFEST_PATH):
+        return manifest
+
+    try:
+        with open(BUILD_MANIFEST_PATH, "rb") as manifest_file:
+            previous = json.load(manifest_file)
+    except ValueError:
+        log("Build manifest is corrupt, regenerating all pages", 1, True)
+        return manifest
+
+    if previous.get("version") == BUILD_MANIFEST_VERSION and previous.get("key") == manifest["key"]:
+        manifest["previous"] = previous["pages"]
+        g_member_cache.load(MEMBER_CACHE_PATH, manifest["key"])
+    return manifest
+
+
+def save_build_manifest():
+    """
+    Saves the page records of this build next to the generated html
+    :return:
+    """
+    data = {"version": BUILD_MANIFEST_VERSION, "key": g_build_manifest["key"], "pages": g_build_manifest["pages"]}
+
+    write_file_atomically(BUILD_MANIFEST_PATH, lambda manifest_file: json.dump(data, manifest_file))
+
+    # only keep the members of pages whose source is still the same
+    inputs = {}
+    for record in g_build_manifest["pages"].values():
+        inputs.update(record["inputs"])
+    g_member_cache.save(MEMBER_CACHE_PATH, g_build_manifest["key"], inputs)
+
+
+class MemberCache(object):
+    """
+    Markup of members by id. Markup of members of the previous build is reused as long as the xml that it was
+    generated from is unchanged.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.members = {}
+        # members of the previous build that haven't been checked yet
+        self.previous = {}
+        # hashes of the xml files that the previous members were generated from
+        self.hashes = {}
+
+    def get(self, member_id):
+        """
+        :param member_id: doxygen id of the member
+        :return: dict of the member's markup, or None
+        """
+        markup = self.members.get(member_id)
+        if markup is None and member_id in self.previous:
+            markup = self.previous.pop(member_id)
+            if not self.is_current(markup):
+                return None
+            self.members[member_id] = markup
+        return markup
+
+    def add(self, member_id, markup):
+        self.previous.pop(member_id, None)
+        self.members[member_id] = markup
+
+    def is_current(self, markup):
+        for path, digest in markup["inputs"].items():
+            if path not in self.hashes:
+                self.hashes[path] = hash_file(os.path.join(BASE_PATH, path))
+            if self.hashes[path] != digest:
+                return False
+        return True
+
+    def load(self, path, key):
+        """
+        Loads the members of the previous build
+        :param path: path of the cache file
+        :param key: build key that the members have to have been generated with
+        :return:
+        """
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "rb") as cache_file:
+                data = pickle.load(cache_file)
+        except Exception as e:
+            log("Member cache is unreadable, regenerating all members: " + str(e), 1, True)
+            return
+        if data.get("version") == self.VERSION and data.get("key") == key:
+            self.previous = data["members"]
+
+    def save(self, path, key, inputs):
+        """
+        Saves the members that came from a page of the build
+        :param path: path of the cache file
+        :param key: build key of the members
+        :param inputs: dict of the hashes of the sources of the build's pages
+        :return:
+        """
+        members = {}
+        for source in (self.previous, self.members):
+            for member_id, markup in source.iteritems():
+                if markup["inputs"] and all(inputs.get(input_path) == digest
+                                            for input_path, digest in markup["inputs"].items()):
+                    members[member_id] = markup
+
+        data = {"version": self.VERSION, "key": key, "members": members}
+        write_file_atomically(path, lambda cache_file: pickle.dump(data, cache_file, pickle.HIGHEST_PROTOCOL))
+
+
+def get_build_key():
+    """
+    Hash of the data that every page depends on
+    :return: string
+    """
+    meta = docs_meta.copy()
+    # the creation date changes every day, which shouldn't be a reason to regenerate everything
+    meta.pop("creation_date", None)
+
+    # the links of the nav are absolute until a page rewrites them, so they are made relative to the docs dir, which
+    # keeps the key the same for a checkout in another place
+    nav = generate_bs4_from_string(str(g_namespaceNav))
+    for a_tag in nav.find_all("a", href=True):
+        if os.path.isabs(a_tag["href"]):
+            a_tag["href"] = os.path.relpath(a_tag["href"], BASE_PATH)
+
+    parts = [
+        str(hash_file(os.path.realpath(__file__))),
+        str(hash_file(os.path.join(BASE_PATH, "python", "utils.py"))),
+        json.dumps(meta, sort_keys=True),
+        str(nav.body)
+    ]
+    return hashlib.md5("\n".join(parts)).hexdigest()
+
+
+def hash_file(path):
+    """
+    Hashes the contents of a file
+    :param path: path of the file
+    :return: md5 hex digest, or None if the file does not exist
+    """
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as in_file:
+        return hashlib.md5(in_file.read()).hexdigest()
+
+
+def write_file_atomically(path, write_fn):
+    """
+    Writes a file through a temp file that replaces it once written, so an interrupted build never leaves a half
+    written file behind
+    :param path: path of the file
+    :param write_fn: function that writes the contents to the binary file object it is passed
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as out_file:
+        write_fn(out_file)
+    # windows can't rename over an existing file
+    if os.name == "nt" and os.path.exists(path):
+        os.remove(path)
+    os.rename(temp_path, path)
+
+
+def get_template_fingerprint(path):
+    """
+    Hashes a template along with all of the partials it includes
+    :param path: path of the template
+    :return: md5 hex digest
+    """
+    if path in g_template_fingerprints:
+        return g_template_fingerprints[path]
+    # guard against templates that include themselves
+    g_template_fingerprints[path] = None
+
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as template_file:
+        content = template_file.read()
+
+    parts = [hashlib.md5(content).hexdigest()]
+    for partial in sorted(set(re.findall(r"{{>\s*([^}\s]+)\s*}}", content))):
+        partial_path = os.path.join(TEMPLATE_PATH, partial + ".mustache")
+        parts.append(partial + ":" + str(get_template_fingerprint(partial_path)))
+
+    fingerprint = hashlib.md5("\n".join(parts)).hexdigest()
+    g_template_fingerprints[path] = fingerprint
+    return fingerprint
+
+
+def describe_symbol(value, ignored_fields=(), depth=0):
+    """
+    Turns a symbol map object into nested lists that can be hashed. Objects referenced by the symbol are only
+    described in full one level deep
+    :param value: symbol map object, list or value
+    :param ignored_fields: names of object fields to leave out
+    :param depth: how deep the value is nested in the described symbol
+    :return: list or value
+    """
+    if isinstance(value, (list, tuple)):
+        return [describe_symbol(item, ignored_fields, depth) for item in value]
+    elif isinstance(value, basestring):
+        if isinstance(value, str):
+            value = value.decode("utf-8", "replace")
+        # paths in the docs dir are described relative to it, so a checkout in another place keeps its fingerprints
+        if value.startswith(BASE_PATH):
+            value = os.path.relpath(value, BASE_PATH)
+        return value
+    elif hasattr(value, "__dict__"):
+        if depth > 1:
+            return [type(value).__name__, describe_symbol(getattr(value, "name", None)), describe_symbol(getattr(value, "path", None))]
+        # fields starting with _ hold values computed on demand from the other fields
+        fields = [[key, describe_symbol(item, ignored_fields, depth + 1)] for key, item in sorted(vars(value).items())
+                  if key not in ignored_fields and not key.startswith("_")]
+        return [type(value).__name__] + fields
+    return value
+
+
+def symbol_fingerprint(value, source, seen=None):
+    """
+    Hashes the symbol(s) returned by a lookup
+    :param value: symbol map object or list of objects
+    :param source: source of the page that made the lookup, relative to the docs dir
+    :param seen: dict of fingerprints by object id. Pages change symbols after looking them up, so an object
+    keeps the fingerprint it had when the page first came across it
+    :return: md5 hex digest
+    """
+    if isinstance(value, list):
+        return hashlib.md5(" ".join(symbol_fingerprint(item, source, seen) for item in value)).hexdigest()
+
+    if seen is not None and id(value) in seen:
+        return seen[id(value)]
+
+    # guides don't depend on what other guides added to a symbol. Leaving it out also keeps guides that are
+    # processed in parallel, and see each others changes in whatever order, from being regenerated needlessly
+    ignored_fields = GUIDE_SYMBOL_FIELDS if get_file_extension(source).lower() == ".html" else ()
+    fingerprint = hashlib.md5(repr(describe_symbol(value, ignored_fields))).hexdigest()
+    if seen is not None:
+        seen[id(value)] = fingerprint
+    return fingerprint
+
+
+def record_lookup(method_name, args, result):
+    """
+    Records a symbol map lookup made by the page being generated
+    :param method_name: name of the SymbolMap method
+    :param args: arguments the method was called with
+    :param result: the symbol(s) that were found
+    :return:
+    """
+    # bs4 strings are passed in from ci tags
+    args = [unicode(arg) if isinstance(arg, unicode) else arg for arg in args]
+    key = repr([method_name] + args)
+    if key not in state.build_record["lookups"]:
+        state.build_record["lookups"][key] = [method_name, args, symbol_fingerprint(result, state.build_record["source"], state.build_fingerprints)]
+
+
+def record_template(path):
+    if state.build_record is not None:
+        state.build_record["templates"][os.path.relpath(path, BASE_PATH)] = get_template_fingerprint(path)
+
+
+def get_page_inputs(in_path):
+    """
+    Hashes the source files of a page
+    :param in_path: xml or html source of the page
+    :return: dict of paths relative to the docs dir and their hashes
+    """
+    paths = [in_path]
+    # guides are also configured by the config.json in their directory
+    if get_file_extension(in_path).lower() == ".html":
+        paths.append(os.path.join(os.path.dirname(in_path), "config.json"))
+    return dict((os.path.relpath(path, BASE_PATH), hash_file(path)) for path in paths)
+
+
+def is_page_current(record):
+    """
+    Tests whether the sources, templates and symbols that went into a page are unchanged
+    :param record: the page record of the previous build
+    :return: Boolean
+    """
+    if record["output"] and not os.path.exists(os.path.join(BASE_PATH, record["output"])):
+        return False
+
+    for path, digest in record["inputs"].items():
+        if hash_file(os.path.join(BASE_PATH, path)) != digest:
+            return False
+
+    for path, fingerprint in record["templates"].items():
+        if get_template_fingerprint(os.path.join(BASE_PATH, path)) != fingerprint:
+            return False
+
+    for method_name, lookup_args, fingerprint in record["lookups"].values():
+        try:
+            result = getattr(g_symbolMap, method_name)(*lookup_args)
+        except Exception:
+            return False
+        if symbol_fingerprint(result, record["source"]) != fingerprint:
+            return False
+
+    return True
+
+
+def generate_page(process_fn, in_path, out_path, *process_args):
+    """
+    Generates a page, timing it when profiling
+    :param process_fn: process_html_file or process_xml_file_definition
+    :param in_path: xml or html source of the page
+    :param out_path: final html file location
+    :param process_args: any other arguments for process_fn
+    :return:
+    """
+    if g_profiler is None:
+        build_page(process_fn, in_path, out_path, *process_args)
+        return
+
+    with g_profiler.page(os.path.relpath(in_path, BASE_PATH)) as page_stats:
+        page_stats["skipped"] = not build_page(process_fn, in_path, out_path, *process_args)
+
+
+def build_page(process_fn, in_path, out_path, *process_args):
+    """
+    Generates a page, or skips it if nothing that went into it has changed since the last build
+    :param process_fn: process_html_file or process_xml_file_definition
+    :param in_path: xml or html source of the page
+    :param out_path: final html file location
+    :param process_args: any other arguments for process_fn
+    :return: False if the page was skipped
+    """
+    if g_build_manifest is None:
+        process_fn(in_path, out_path, *process_args)
+        return True
+
+    source = os.path.relpath(in_path, BASE_PATH)
+    record = g_build_manifest["previous"].get(source)
+    if record is not None and is_page_current(record):
+        log("Skipping unchanged file: " + in_path, key="Skipping unchanged file")
+        replay_page(record)
+        add_build_record(record)
+        return False
+
+    state.build_record = {
+        "source": source,
+        "inputs": get_page_inputs(in_path),
+        "templates": {},
+        "lookups": {},
+        "symbols": [],
+        "search": [],
+        "output": None
+    }
+    state.build_fingerprints = {}
+    try:
+        process_fn(in_path, out_path, *process_args)
+        record = state.build_record
+    finally:
+        state.build_record = None
+        state.build_fingerprints = None
+
+    if not record.get("volatile"):
+        add_build_record(record)
+    return True
+
+
+def replay_page(record):
+    """
+    Repeats the symbol map changes and search index entries of a skipped page
+    :param record: the page record of the previous build
+    :return:
+    """
+    for update in record["symbols"]:
+        # json hands back unicode, while the page generated utf-8 strings
+        update = [value.encode("utf-8") if isinstance(value, unicode) and index != 3 else value for index, value in enumerate(update)]
+        apply_symbol_update(update)
+        record_symbol_update(update)
+
+    for search_entry in record["search"]:
+        if state.page_record is not None:
+            state.page_record["search"].append(search_entry)
+        else:
+            append_search_index(*search_entry)
+
+
+def add_build_record(record):
+    # worker processes hand their records back to the parent process
+    if state.page_record is not None:
+        state.page_record["build"] = record
+    else:
+        g_build_manifest["pages"][record["source"]] = record
+
+
+# number of threads that copy the assets
+COPY_THREADS = 8
+# ioctl that clones a file on linux
+FICLONE = 0x40049409
+
+
 def copy_files():
+    """
+    Copies the assets of htmlsrc/ to html/, skipping the ones that are unchanged since the last run
+    """
     src = HTML_SOURCE_PATH
     dest = HTML_DEST_PATH
 
     try:
-        copytree(src, dest, ignore=shutil.ignore_patterns("_templates*", "*.html"))
+        copies = get_asset_copies(src, dest, ignore=shutil.ignore_patterns("_templates*", "*.html"))
     except OSError as e:
         log('Directory not copied. Error:' + str(e))
+        return
 
+    if len(copies) > 1 and COPY_THREADS > 1:
+        # copying is mostly waiting on the disk, so threads are enough
+        pool = multiprocessing.pool.ThreadPool(min(COPY_THREADS, len(copies)))
+        try:
+            pool.map(copy_asset, copies)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for paths in copies:
+            copy_asset(paths)
+    log("copied " + str(len(copies)) + " changed assets")
 
-# from http://stackoverflow.com/a/22331852/680667
-def copytree(src, dst, symlinks=False, ignore=None):
-    """ Copies all of the files from the source directory
-        to a destination directory. Pass in anything that should be ignored.
-    """
 
+def get_asset_copies(src, dst, ignore=None):
+    """
+    Walks the source directory like copytree, creating the directories that are missing in the destination
+    directory, and lists the files that need to be copied
+    :param src: source directory
+    :param dst: destination directory
+    :param ignore: callable that returns the names to skip, like the ignore argument of shutil.copytree
+    :return: list of (source, destination) path tuples
+    """
     if not os.path.exists(dst):
         os.makedirs(dst)
         shutil.copystat(src, dst)
@@ -3648,24 +5335,82 @@ def copytree(src, dst, symlinks=False, ignore=None):
         excl = ignore(src, lst)
         lst = [x for x in lst if x not in excl]
 
+    copies = []
     for item in lst:
         s = os.path.join(src, item)
         d = os.path.join(dst, item)
 
-        if symlinks and os.path.islink(s):
-            if os.path.lexists(d):
-                os.remove(d)
-                os.symlink(os.readlink(s), d)
-            try:
-                st = os.lstat(s)
-                mode = stat.S_IMODE(st.st_mode)
-                os.lchmod(d, mode)
-            except:
-                pass  # lchmod not available
-        elif os.path.isdir(s):
-            copytree(s, d, symlinks, ignore)
-        else:
-            shutil.copy2(s, d)
+        if os.path.isdir(s):
+            copies.extend(get_asset_copies(s, d, ignore))
+        elif not is_asset_current(s, d):
+            copies.append((s, d))
+    return copies
+
+
+def is_asset_current(src, dst):
+    """
+    Tests whether the destination file is the same as the source file. The size and mtime are compared first,
+    which copies keep, and the contents only if the mtime is all that differs
+    :param src: source file
+    :param dst: destination file
+    :return: Boolean
+    """
+    try:
+        dst_stat = os.stat(dst)
+    except OSError:
+        return False
+    src_stat = os.stat(src)
+
+    # hard links are only fine if that's what was asked for. A copy is relinked if the link can be made, but not
+    # across devices, where copy_asset falls back to copying
+    is_link = src_stat.st_ino == dst_stat.st_ino and src_stat.st_dev == dst_stat.st_dev
+    if is_link:
+        return args.copy_mode == "hardlink"
+    if args.copy_mode == "hardlink" and src_stat.st_dev == dst_stat.st_dev:
+        return False
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if abs(src_stat.st_mtime - dst_stat.st_mtime) < 0.001:
+        return True
+
+    # touched, but possibly not changed, as happens on checkouts
+    if hash_file(src) != hash_file(dst):
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def copy_asset(paths):
+    """
+    Copies, hard links or reflinks a file, depending on --copy-mode
+    :param paths: tuple of the source and destination path
+    """
+    src, dst = paths
+    # never write through a hard link of the source
+    if os.path.lexists(dst):
+        os.remove(dst)
+
+    try:
+        if args.copy_mode == "hardlink":
+            os.link(src, dst)
+            return
+        if args.copy_mode == "reflink" and fcntl is not None:
+            reflink(src, dst)
+            shutil.copystat(src, dst)
+            return
+    except (IOError, OSError):
+        # not supported by the file system, or across devices
+        pass
+    shutil.copy2(src, dst)
+
+
+def reflink(src, dst):
+    """
+    Makes dst a copy on write clone of src, which linux file systems such as btrfs and xfs support
+    """
+    with open(src, "rb") as src_file:
+        with open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
 
 
 def parse_metadata():
@@ -3695,9 +5440,31 @@ def parse_metadata():
     return meta;
 
 
-def log(message, level=0, force=False):    
-    if args.debug or force:
-        logger.log(message, level)
+def log(message, level=0, force=False, key=None):
+    """
+    :param message: message to log
+    :param level: 0 for info, 1 for warning, 2 for error
+    :param force: show the message on the console even without --debug
+    :param key: messages with the same key are counted as repeats of each other and only shown a few times
+    """
+    logger.log(message, level, key, args.debug or force)
+
+
+def log_progress(message):
+    logger.log_progress(message)
+
+
+@contextmanager
+def profile_phase(name):
+    """
+    Times a build phase when profiling
+    :param name: name of the phase in the report
+    """
+    if g_profiler is None:
+        yield
+    else:
+        with g_profiler.phase(name):
+            yield
         
 
 if __name__ == "__main__":
@@ -3714,7 +5481,9 @@ if __name__ == "__main__":
     """
 
     args = parser.parse_args()
-    logger = Logger()
+    logger = Logger(args.log_file)
+    if args.profile:
+        g_profiler = Profiler()
 
     # Make sure we're compiling using pythong 2.7.6+
     version_info = sys.version_info
@@ -3738,39 +5507,62 @@ if __name__ == "__main__":
     docs_meta = parse_metadata();
 
 
-    # Load tag file
+    # generate symbol map from tag file, which is streamed rather than loaded as a whole
     log("parsing tag file", 0, True)
-    g_tag_xml = ET.ElementTree(ET.parse(TAG_FILE_PATH).getroot())
-    # generate symbol map from tag file
-    g_symbolMap = get_symbol_to_file_map()
+    with profile_phase("tag parse and symbol map"):
+        g_symbolMap = get_symbol_map()
 
     # quit();
     # copy files from htmlsrc/ to html/
     log("copying files", 0, True)
-    copy_files()
+    with profile_phase("copy files"):
+        copy_files()
 
     # generate namespace navigation
-    g_namespaceNav = generate_namespace_nav()
+    with profile_phase("namespace nav"):
+        g_namespaceNav = generate_namespace_nav()
+
+    g_member_cache = MemberCache()
 
     log("processing files", 0, True)
     if not args.path: # no args; run all docs
+        # skip pages that haven't changed since the last build
+        g_build_manifest = load_build_manifest()
+
         # process_html_dir(HTML_SOURCE_PATH, "html/")
-        process_dir("xml" + os.sep, "html" + os.sep)
+        with profile_phase("xml pages"):
+            process_dir("xml" + os.sep, "html" + os.sep)
 
         # save search index to json file
-        write_search_index()
+        with profile_phase("search index"):
+            write_search_index()
+        with profile_phase("build manifest"):
+            save_build_manifest()
+        if args.record_contexts and g_template_cache:
+            g_template_cache.save_recorded_contexts(args.record_contexts)
         log("SUCCESSFULLY GENERATED CINDER DOCS!", 0, True)
     elif args.path:
         inPath = args.path
         # process a specific file
         if os.path.isfile(inPath):
-            process_file(inPath, args.outpath if len(sys.argv) > 2 else None)
+            # a single class or namespace page only needs what the guides add to its symbols, not the guides
+            if get_file_extension(inPath).lower() == ".xml" and not args.skiphtml:
+                scan_html_dir(HTML_SOURCE_PATH)
+            with profile_phase("pages"):
+                process_file(inPath, args.outpath if len(sys.argv) > 2 else None)
             log("SUCCESSFULLY GENERATED YOUR FILE!", 0, True)
         elif os.path.isdir(inPath):
             if inPath == "htmlsrc" + os.sep:
                 process_html_dir(HTML_SOURCE_PATH)
             else:
-                process_dir(inPath, "html" + os.sep)
+                with profile_phase("xml pages"):
+                    process_dir(inPath, "html" + os.sep)
             log("SUCCESSFULLY GENERATED YOUR FILES!", 0, True)
     else:
         log("Unknown usage", 1, True)
+
+    if g_profiler is not None:
+        g_profiler.write_report(args.profile)
+        log("wrote build profile to " + args.profile + ".json and " + args.profile + ".txt", 0, True)
+
+    logger.close()
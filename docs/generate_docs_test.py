@@ -0,0 +1,225 @@
+"""
+Unit tests for generateDocs.py.
+
+Usage: python generate_docs_test.py
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# generateDocs adds the bundled libs to the path
+import generateDocs
+from generateDocs import BASE_PATH, ET, SymbolMap, build_search_shards, parse_xml
+
+# a namespace with a struct, whose page is generated after the namespace page and looks the namespace up
+TEST_TAG_FILE = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<tagfile>
+  <compound kind="struct">
+    <name>cinder::Area</name>
+    <filename>structcinder_1_1_area.html</filename>
+  </compound>
+  <compound kind="namespace">
+    <name>cinder</name>
+    <filename>namespacecinder.html</filename>
+    <class kind="struct">cinder::Area</class>
+  </compound>
+</tagfile>
+"""
+
+TEST_XML_FILES = {
+    # the project meta file
+    "_cinder_8h.xml": """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.8.10">
+  <compounddef id="_cinder_8h" kind="file" language="C++">
+    <compoundname>Cinder.h</compoundname>
+    <sectiondef kind="define">
+      <memberdef kind="define" id="_cinder_8h_1a1" prot="public" static="no">
+        <name>CINDER_VERSION_STR</name>
+        <initializer>&quot;0.9.1dev&quot;</initializer>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+""",
+    "namespacecinder.xml": """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.8.10">
+  <compounddef id="namespacecinder" kind="namespace" language="C++">
+    <compoundname>cinder</compoundname>
+    <innerclass refid="structcinder_1_1_area" prot="public">cinder::Area</innerclass>
+    <briefdescription></briefdescription>
+    <detaileddescription></detaileddescription>
+  </compounddef>
+</doxygen>
+""",
+    "structcinder_1_1_area.xml": """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.8.10">
+  <compounddef id="structcinder_1_1_area" kind="struct" language="C++" prot="public">
+    <compoundname>cinder::Area</compoundname>
+    <briefdescription><para>An area.</para></briefdescription>
+    <detaileddescription></detaileddescription>
+  </compounddef>
+</doxygen>
+"""
+}
+
+
+def setUpModule():
+    generateDocs.args = generateDocs.parser.parse_args([])
+    generateDocs.logger = generateDocs.Logger()
+
+
+class ParseXmlTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_xml(self, content):
+        path = os.path.join(self.tmp_dir, "test.xml")
+        with open(path, "wb") as xml_file:
+            xml_file.write(content)
+        return path
+
+    def test_utf8(self):
+        tree = parse_xml(self.write_xml(b'<?xml version="1.0" encoding="UTF-8"?><doc>caf\xc3\xa9</doc>'))
+        self.assertIsNotNone(tree)
+        self.assertEqual(tree.text, u"caf\xe9")
+
+    def test_invalid_utf8(self):
+        # a latin-1 byte isn't valid utf-8, and is replaced rather than dropping the file
+        tree = parse_xml(self.write_xml(b'<?xml version="1.0" encoding="UTF-8"?><doc>caf\xe9</doc>'))
+        self.assertIsNotNone(tree)
+        self.assertEqual(tree.text, u"caf\ufffd")
+
+
+class ClassGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.symbol_map = SymbolMap()
+        self.add_class("cinder::Base")
+        self.add_class("cinder::Child", "cinder::Base")
+
+    def add_class(self, name, base=None):
+        class_tree = ET.fromstring("<compound kind=\"class\"><name /><filename /></compound>")
+        class_tree.find("name").text = name
+        class_tree.find("filename").text = name.replace("::", "_") + ".html"
+        if base:
+            ET.SubElement(class_tree, "base").text = base
+        self.symbol_map.add_class(name, SymbolMap.Class(class_tree))
+
+    def get_names(self, class_list):
+        return [class_obj.qualifiedName for class_obj in class_list]
+
+    def test_added_subclass(self):
+        self.assertEqual(self.get_names(self.symbol_map.get_class_descendants("cinder::Child")), [])
+        self.assertEqual(self.get_names(self.symbol_map.get_class_ancestors("cinder::GrandChild")), [])
+
+        self.add_class("cinder::GrandChild", "cinder::Child")
+        self.assertEqual(self.get_names(self.symbol_map.get_class_descendants("cinder::Child")), ["cinder::GrandChild"])
+        self.assertEqual(self.get_names(self.symbol_map.get_class_lineage("cinder::GrandChild")),
+                         ["cinder::Base", "cinder::Child"])
+        self.assertEqual(self.get_names(self.symbol_map.get_class_ancestors("cinder::GrandChild")),
+                         ["cinder::Child", "cinder::GrandChild"])
+
+    def test_changed_base(self):
+        self.assertEqual(self.get_names(self.symbol_map.get_class_lineage("cinder::Child")), ["cinder::Base"])
+
+        self.add_class("cinder::OtherBase")
+        self.add_class("cinder::Child", "cinder::OtherBase")
+        self.assertEqual(self.get_names(self.symbol_map.get_class_descendants("cinder::Base")), [])
+        self.assertEqual(self.get_names(self.symbol_map.get_class_descendants("cinder::OtherBase")), ["cinder::Child"])
+        self.assertEqual(self.get_names(self.symbol_map.get_class_lineage("cinder::Child")), ["cinder::OtherBase"])
+
+
+class SearchShardTest(unittest.TestCase):
+
+    def test_shards(self):
+        entries = [
+            {"id": 0, "title": "Surface", "link": "classcinder_1_1_surface_t.html", "tags": [], "type": "class"},
+            {"id": 1, "title": "cinder::gl", "link": "namespacecinder_1_1gl.html", "tags": [], "type": "namespace"},
+            {"id": 2, "title": "Images", "link": "guides/images.html", "tags": [], "type": "guide"},
+            {"id": 3, "title": "Common", "link": "group__core__func__common.html", "tags": [], "type": "module"},
+            {"id": 4, "title": "glm", "link": "namespaceglm.html", "tags": [], "type": "namespace"}
+        ]
+        header, strings, shards = build_search_shards(entries)
+
+        shard_ids = dict((name, [row[0] for row in shard["entries"]]) for name, shard in shards.items())
+        self.assertEqual(shard_ids, {"classes": [0], "namespaces": [1], "guides": [2], "glm": [3, 4]})
+
+
+class BuildManifestTest(unittest.TestCase):
+    """
+    Builds the docs of a small doxygen output in a copy of the docs dir, and then builds them again
+    """
+
+    def setUp(self):
+        self.docs_path = tempfile.mkdtemp()
+        shutil.copy(os.path.join(BASE_PATH, "generateDocs.py"), self.docs_path)
+        for dir_name in ("libs", "python", "htmlsrc"):
+            os.symlink(os.path.join(BASE_PATH, dir_name), os.path.join(self.docs_path, dir_name))
+
+        os.mkdir(os.path.join(self.docs_path, "doxygen"))
+        with open(os.path.join(self.docs_path, "doxygen", "cinder.tag"), "w") as tag_file:
+            tag_file.write(TEST_TAG_FILE)
+
+        os.mkdir(os.path.join(self.docs_path, "xml"))
+        for file_name, content in TEST_XML_FILES.items():
+            with open(os.path.join(self.docs_path, "xml", file_name), "w") as xml_file:
+                xml_file.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.docs_path)
+
+    def build(self, *build_args):
+        """
+        Runs generateDocs.py on the copy of the docs dir
+        :return: list of the sources of the pages that were skipped
+        """
+        log_path = os.path.join(self.docs_path, "build_log.json")
+        if os.path.exists(log_path):
+            os.remove(log_path)
+
+        with open(os.devnull, "w") as devnull:
+            subprocess.check_call([sys.executable, "generateDocs.py", "--log-file", log_path] + list(build_args),
+                                  cwd=self.docs_path, stdout=devnull, stderr=devnull)
+
+        skipped = []
+        with open(log_path) as log_file:
+            for line in log_file:
+                message = json.loads(line)["message"]
+                if message.startswith("Skipping unchanged file: "):
+                    # xml pages are logged relative to the docs dir, guides with their full path
+                    page_path = os.path.join(self.docs_path, message[len("Skipping unchanged file: "):])
+                    skipped.append(os.path.relpath(page_path, self.docs_path))
+        return skipped
+
+    def get_manifest_pages(self):
+        with open(os.path.join(self.docs_path, "html", ".build_manifest.json")) as manifest_file:
+            return sorted(json.load(manifest_file)["pages"].keys())
+
+    def test_unchanged_build(self):
+        self.build("--full")
+        pages = self.get_manifest_pages()
+        self.assertIn("xml/namespacecinder.xml", pages)
+        self.assertIn("xml/structcinder_1_1_area.xml", pages)
+
+        # nothing changed, so no page is regenerated, also not after the pages were skipped once
+        self.assertEqual(sorted(self.build()), pages)
+        self.assertEqual(sorted(self.build()), pages)
+
+    def test_unchanged_parallel_build(self):
+        # the manifest of a serial build is just as current for a parallel one
+        self.build("--full")
+        pages = self.get_manifest_pages()
+        self.assertEqual(sorted(self.build("-j", "2")), pages)
+
+
+if __name__ == "__main__":
+    unittest.main()
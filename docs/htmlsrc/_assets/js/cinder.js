@@ -1,4 +1,130 @@
 var section;
+
+/*
+* ----------------------------------------------------------------------
+*  Search index, generated by generateDocs.py as a string table and
+*  shards that are only loaded once the search is used
+* ----------------------------------------------------------------------
+*/
+var cinderSearch = {
+
+	strings: [],
+	callbacks: [],
+	pending: -1,
+
+	// the shards are merged into one lunr index, so that terms are weighed
+	// across all pages, as in a single index
+	store: {},
+	root: { docs: {} },
+	corpusTokens: [],
+	tokenCount: 0,
+	entryCount: 0,
+	index: null,
+
+	/*
+	* Loads the string table and the shards listed in search_index.js
+	* @param {Function} callback Called once all shards are loaded
+	*/
+	load: function( callback ){
+		if( this.pending === 0 || !search_index_data.shards ){
+			callback();
+			return;
+		}
+		this.callbacks.push( callback );
+		if( this.pending > 0 )
+			return;
+
+		// the files are next to search_index.js
+		var indexScript = document.querySelector( 'script[src$="search_index.js"]' );
+		var baseUrl = indexScript.src.substr( 0, indexScript.src.lastIndexOf( '/' ) + 1 );
+		var files = [search_index_data.strings].concat( search_index_data.shards );
+		this.pending = files.length;
+
+		for( var i = 0; i < files.length; i++ ){
+			var script = document.createElement( 'script' );
+			// keep the string table ahead of the shards
+			script.async = false;
+			script.src = baseUrl + files[i];
+			script.onload = script.onerror = this.fileLoaded.bind( this );
+			document.body.appendChild( script );
+		}
+	},
+
+	fileLoaded: function(){
+		if( --this.pending > 0 )
+			return;
+		var callbacks = this.callbacks;
+		this.callbacks = [];
+		for( var i = 0; i < callbacks.length; i++ )
+			callbacks[i]();
+	},
+
+	addStrings: function( strings ){
+		this.strings = strings;
+	},
+
+	/*
+	* Adds the entries of a shard to search_index_data.data and its terms to the index
+	* @param {Object} shard Entries as [id, title, link, type] and terms as
+	*                       [term, entry, tf, entry, tf, ...] rows
+	*/
+	addShard: function( shard ){
+		var strings = this.strings;
+		var store = this.store;
+
+		for( var i = 0; i < shard.entries.length; i++ ){
+			var entry = shard.entries[i];
+			store[entry[0]] = [];
+			search_index_data.data[entry[0]] = {
+				id: entry[0],
+				title: strings[entry[1]],
+				link: strings[entry[2]],
+				type: search_index_data.types[entry[3]]
+			};
+		}
+		this.entryCount += shard.entries.length;
+
+		// terms come sorted and each entry is in one shard only, so the token
+		// lists of the documents stay sorted too
+		for( var i = 0; i < shard.terms.length; i++ ){
+			var row = shard.terms[i];
+			var token = strings[row[0]];
+			var node = this.root;
+			for( var c = 0; c < token.length; c++ )
+				node = node[token[c]] || ( node[token[c]] = { docs: {} } );
+			if( Object.keys( node.docs ).length === 0 )
+				this.corpusTokens.push( token );
+			for( var j = 1; j < row.length; j += 2 ){
+				var ref = shard.entries[row[j]][0];
+				node.docs[ref] = { ref: ref, tf: row[j + 1] };
+				store[ref].push( token );
+				this.tokenCount++;
+			}
+		}
+		this.index = null;
+	},
+
+	/*
+	* Searches the loaded shards
+	* @return {Array} results, best match first
+	*/
+	search: function( term ){
+		if( !this.index ){
+			this.index = lunr.Index.load( {
+				version: lunr.version,
+				fields: search_index_data.fields,
+				ref: 'id',
+				documentStore: { store: this.store, length: this.entryCount },
+				tokenStore: { root: this.root, length: this.tokenCount },
+				// lunr expects the corpus tokens in order
+				corpusTokens: this.corpusTokens.sort(),
+				pipeline: search_index_data.pipeline
+			} );
+		}
+		return this.index.search( term );
+	}
+};
+
 $(document).ready(function() {
 
 	var _this = this;
@@ -260,6 +386,12 @@ $(document).ready(function() {
 	    	return;
 	    }
 
+	    // load the shards on the first search, then search again
+	    if( cinderSearch.pending !== 0 && search_index_data.shards ){
+	    	cinderSearch.load( function(){ search( input.value ); } );
+	    	return;
+	    }
+
 	    var searchTerm = term.replace(":", " ");
 	    var maxResults = 15;
 	    var results = search_index.search( searchTerm );
@@ -466,6 +598,12 @@ $(document).ready(function() {
 	});
 
 	function initSearch(){
+		// the index is prebuilt by generateDocs.py, so it only has to be loaded
+		if( search_index_data.shards ){
+			window.search_index = cinderSearch;
+			return;
+		}
+
 		for(var item in search_index_data.data){
 			var searchItem = search_index_data.data[item];
 			// console.log(searchItem.tags);
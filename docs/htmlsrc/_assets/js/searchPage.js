@@ -80,5 +80,7 @@ $(document).ready(function() {
 		});
 	};
 
-	fillSearch( searchTerm );
+	cinderSearch.load( function(){
+		fillSearch( searchTerm );
+	} );
 });
\ No newline at end of file
@@ -0,0 +1,156 @@
+# coding: utf-8
+
+"""
+Exposes a compile_template() function to compile parsed templates to Python
+functions.
+
+"""
+
+from pystache.parser import (_ChangeNode, _CommentNode, _EscapeNode, _InvertedNode,
+                             _LiteralNode, _SectionNode)
+
+
+def compile_template(parsed_template):
+    """
+    Compile a ParsedTemplate instance to a Python function.
+
+    The function accepts a RenderEngine instance and a ContextStack instance
+    and returns the same unicode string as parsed_template.render() does.
+    Nested sections are compiled inline, while partials are still resolved
+    at render time since they can change between renders.
+
+    Examples:
+
+    >>> from pystache.parser import parse
+    >>> print compile_source(parse(u"Hey {{#who}}{{name}}!{{/who}}"))
+    def render(engine, context):
+        parts = []
+        append = parts.append
+        fetch_string = engine.fetch_string
+        fetch_section_data = engine.fetch_section_data
+        resolve_context = engine.resolve_context
+        escape = engine.escape
+        literal = engine.literal
+        append(_constants[0])
+        for value1 in fetch_section_data(context, _constants[1]):
+            if callable(value1):
+                node = _nodes[0]
+                value1 = value1(node.template[node.index_begin:node.index_end])
+                append(engine._render_value(value1, context, delimiters=node.delimiters))
+                continue
+            context.push(value1)
+            append(escape(fetch_string(context, _constants[2])))
+            append(_constants[3])
+            context.pop()
+        return unicode(''.join(parts))
+    <BLANKLINE>
+
+    """
+    compiler = _Compiler()
+    source = compiler.compile(parsed_template)
+
+    namespace = {'_constants': compiler.constants, '_nodes': compiler.nodes,
+                 'unicode': unicode}
+    code = compile(source, '<compiled mustache template>', 'exec')
+    exec code in namespace
+
+    return namespace['render']
+
+
+def compile_source(parsed_template):
+    """
+    Return the Python source code that compile_template() compiles.
+
+    """
+    return _Compiler().compile(parsed_template)
+
+
+class _Compiler(object):
+
+    """
+    Generates the source code of a render function from a parse tree.
+
+    String values (literal text and tag keys) are referenced from the
+    constants list rather than written out as literals, and nodes that
+    need to be consulted at render time from the nodes list.
+
+    """
+
+    def __init__(self):
+        self.constants = []
+        self.nodes = []
+        self._lines = []
+        self._depth = 0
+
+    def compile(self, parsed_template):
+        self._line(0, "def render(engine, context):")
+        self._line(1, "parts = []")
+        self._line(1, "append = parts.append")
+        self._line(1, "fetch_string = engine.fetch_string")
+        self._line(1, "fetch_section_data = engine.fetch_section_data")
+        self._line(1, "resolve_context = engine.resolve_context")
+        self._line(1, "escape = engine.escape")
+        self._line(1, "literal = engine.literal")
+        self._compile_tree(parsed_template, 1)
+        self._line(1, "return unicode(''.join(parts))")
+
+        return "\n".join(self._lines) + "\n"
+
+    def _line(self, indent, line):
+        self._lines.append("    " * indent + line)
+
+    def _constant(self, value):
+        self.constants.append(value)
+        return "_constants[%d]" % (len(self.constants) - 1)
+
+    def _node(self, node):
+        self.nodes.append(node)
+        return "_nodes[%d]" % (len(self.nodes) - 1)
+
+    def _compile_tree(self, parsed_template, indent):
+        line_count = len(self._lines)
+
+        for node in parsed_template._parse_tree:
+            self._compile_node(node, indent)
+
+        if len(self._lines) == line_count:
+            self._line(indent, "pass")
+
+    def _compile_node(self, node, indent):
+        if type(node) is unicode:
+            if node:
+                self._line(indent, "append(%s)" % self._constant(node))
+        elif isinstance(node, (_CommentNode, _ChangeNode)):
+            return
+        elif isinstance(node, _EscapeNode):
+            self._line(indent, "append(escape(fetch_string(context, %s)))" % self._constant(node.key))
+        elif isinstance(node, _LiteralNode):
+            self._line(indent, "append(literal(fetch_string(context, %s)))" % self._constant(node.key))
+        elif isinstance(node, _InvertedNode):
+            # Note that lambdas are considered truthy for inverted sections
+            # per the spec.
+            self._line(indent, "if not resolve_context(context, %s):" % self._constant(node.key))
+            self._compile_tree(node.parsed_section, indent + 1)
+        elif isinstance(node, _SectionNode):
+            self._compile_section(node, indent)
+        else:
+            # Partials and any other node render themselves.
+            self._line(indent, "append(%s.render(engine, context))" % self._node(node))
+
+    def _compile_section(self, node, indent):
+        self._depth += 1
+        value = "value%d" % self._depth
+
+        self._line(indent, "for %s in fetch_section_data(context, %s):" % (value, self._constant(node.key)))
+        # Lambdas bypass pushing the data value onto the context stack,
+        # like in _SectionNode.render().
+        self._line(indent + 1, "if callable(%s):" % value)
+        self._line(indent + 2, "node = %s" % self._node(node))
+        self._line(indent + 2, "%s = %s(node.template[node.index_begin:node.index_end])" % (value, value))
+        self._line(indent + 2, "append(engine._render_value(%s, context, delimiters=node.delimiters))" % value)
+        self._line(indent + 2, "continue")
+        self._line(indent + 1, "context.push(%s)" % value)
+        self._compile_tree(node.parsed, indent + 1)
+        self._line(indent + 1, "context.pop()")
+
+        self._depth -= 1
@@ -44,6 +44,10 @@ DELIMITERS = (u'{{', u'}}')
 # How to handle missing tags when rendering a template.
 MISSING_TAGS = MissingTags.ignore
 
+# The number of parsed templates a Renderer keeps, keyed by template string
+# and delimiters, so that partials rendered many times are parsed once.
+PARSE_CACHE_SIZE = 256
+
 # The starting list of directories in which to search for templates when
 # loading a template by file name.
 SEARCH_DIRS = [os.curdir]  # i.e. ['.']
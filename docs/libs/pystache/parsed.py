@@ -20,6 +20,7 @@ class ParsedTemplate(object):
 
     def __init__(self):
         self._parse_tree = []
+        self._compiled = None
 
     def __repr__(self):
         return repr(self._parse_tree)
@@ -48,3 +49,19 @@ class ParsedTemplate(object):
         s = ''.join(parts)
 
         return unicode(s)
+
+    def compile(self):
+        """
+        Return a function equivalent to this instance's render() method.
+
+        The template is compiled to a Python function on the first call
+        (see the compiler module), and the function is kept for later calls.
+        The template must not be added to after it is compiled.
+
+        """
+        if self._compiled is None:
+            # Import here to avoid a circular import with the parser module.
+            from pystache.compiler import compile_template
+            self._compiled = compile_template(self)
+
+        return self._compiled
@@ -6,6 +6,7 @@ Exposes a parse() function to parse template strings.
 """
 
 import re
+from collections import OrderedDict
 
 from pystache import defaults
 from pystache.parsed import ParsedTemplate
@@ -41,6 +42,64 @@ def parse(template, delimiters=None):
     return parser.parse(template)
 
 
+class ParseCache(object):
+
+    """
+    A bounded least-recently-used cache of ParsedTemplate instances, keyed
+    by template string and delimiters.
+
+    """
+
+    def __init__(self, max_size=None):
+        """
+        Arguments:
+
+          max_size: the number of parsed templates to keep.  Pass 0 to
+            disable caching.  Defaults to the package default.
+
+        """
+        if max_size is None:
+            max_size = defaults.PARSE_CACHE_SIZE
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._parsed = OrderedDict()
+
+    def __len__(self):
+        return len(self._parsed)
+
+    def clear(self):
+        self._parsed.clear()
+
+    def parse(self, template, delimiters=None):
+        """
+        Parse a unicode template string like parse(), returning the cached
+        ParsedTemplate instance if the template was parsed before.
+
+        """
+        if delimiters is None:
+            delimiters = defaults.DELIMITERS
+        # Delimiters set within a template are lists.
+        key = (template, tuple(delimiters))
+
+        try:
+            parsed = self._parsed.pop(key)
+        except KeyError:
+            self.misses += 1
+            parsed = parse(template, delimiters)
+            if self.max_size <= 0:
+                return parsed
+            if len(self._parsed) >= self.max_size:
+                # Then discard the least recently used template.
+                self._parsed.popitem(last=False)
+        else:
+            self.hits += 1
+
+        self._parsed[key] = parsed
+        return parsed
+
+
 def _compile_template_re(delimiters):
     """
     Return a regular expresssion object (re.RegexObject) instance.
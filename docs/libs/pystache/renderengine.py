@@ -43,7 +43,8 @@ class RenderEngine(object):
     #   that encapsulates the customizable aspects of converting
     #   strings and resolving partials and names from context.
     def __init__(self, literal=None, escape=None, resolve_context=None,
-                 resolve_partial=None, to_str=None):
+                 resolve_partial=None, to_str=None, parse_cache=None,
+                 compiled=False):
         """
         Arguments:
 
@@ -81,12 +82,23 @@ class RenderEngine(object):
             coercion whenever a string is required (e.g. for converting None
             or 0 to a string).
 
+          parse_cache: a ParseCache instance to parse templates with, so
+            that templates rendered repeatedly (e.g. partials) are parsed
+            once.  If None, templates are parsed on every render.
+
+          compiled: whether to render templates by compiling them to Python
+            functions (see ParsedTemplate.compile()) instead of walking
+            their parse trees.  Compiling costs more than one render, so
+            this pays off together with a parse cache.  Defaults to False.
+
         """
         self.escape = escape
         self.literal = literal
         self.resolve_context = resolve_context
         self.resolve_partial = resolve_partial
         self.to_str = to_str
+        self.parse_cache = parse_cache
+        self.compiled = compiled
 
     # TODO: Rename context to stack throughout this module.
 
@@ -176,6 +188,25 @@ class RenderEngine(object):
           context_stack: a ContextStack instance.
 
         """
-        parsed_template = parse(template, delimiters)
+        if self.parse_cache is None:
+            parsed_template = parse(template, delimiters)
+        else:
+            parsed_template = self.parse_cache.parse(template, delimiters)
+
+        return self.render_parsed(parsed_template, context_stack)
+
+    def render_parsed(self, parsed_template, context_stack):
+        """
+        Render a ParsedTemplate instance, and return as unicode.
+
+        Arguments:
+
+          parsed_template: a ParsedTemplate instance.
+
+          context_stack: a ContextStack instance.
+
+        """
+        if self.compiled:
+            return parsed_template.compile()(self, context_stack)
 
         return parsed_template.render(self, context_stack)
@@ -12,6 +12,7 @@ from pystache.common import TemplateNotFoundError, MissingTags, is_string
 from pystache.context import ContextStack, KeyNotFoundError
 from pystache.loader import Loader
 from pystache.parsed import ParsedTemplate
+from pystache.parser import ParseCache
 from pystache.renderengine import context_get, RenderEngine
 from pystache.specloader import SpecLoader
 from pystache.template_spec import TemplateSpec
@@ -49,7 +50,8 @@ class Renderer(object):
 
     def __init__(self, file_encoding=None, string_encoding=None,
                  decode_errors=None, search_dirs=None, file_extension=None,
-                 escape=None, partials=None, missing_tags=None):
+                 escape=None, partials=None, missing_tags=None,
+                 parse_cache_size=None, compiled=False):
         """
         Construct an instance.
 
@@ -108,6 +110,16 @@ class Renderer(object):
             the value of the tag is the empty string.  Defaults to the
             package default.
 
+          parse_cache_size: the number of parsed templates to keep between
+            renders, keyed by template string and delimiters.  Pass 0 to
+            parse templates on every render.  Defaults to the package
+            default.
+
+          compiled: whether to compile templates to Python functions and
+            render with those instead of interpreting the parse tree.  The
+            compiled functions are kept with the parsed templates in the
+            parse cache.  Defaults to False.
+
         """
         if decode_errors is None:
             decode_errors = defaults.DECODE_ERRORS
@@ -134,11 +146,13 @@ class Renderer(object):
             search_dirs = [search_dirs]
 
         self._context = None
+        self.compiled = compiled
         self.decode_errors = decode_errors
         self.escape = escape
         self.file_encoding = file_encoding
         self.file_extension = file_extension
         self.missing_tags = missing_tags
+        self.parse_cache = ParseCache(parse_cache_size)
         self.partials = partials
         self.search_dirs = search_dirs
         self.string_encoding = string_encoding
@@ -156,6 +170,22 @@ class Renderer(object):
         """
         return self._context
 
+    @property
+    def parse_cache_hits(self):
+        """
+        Return the number of times a template was found in the parse cache.
+
+        """
+        return self.parse_cache.hits
+
+    @property
+    def parse_cache_misses(self):
+        """
+        Return the number of times a template had to be parsed.
+
+        """
+        return self.parse_cache.misses
+
     # We could not choose str() as the name because 2to3 renames the unicode()
     # method of this class to str().
     def str_coerce(self, val):
@@ -332,7 +362,9 @@ class Renderer(object):
                               escape=self._escape_to_unicode,
                               resolve_context=resolve_context,
                               resolve_partial=resolve_partial,
-                              to_str=self.str_coerce)
+                              to_str=self.str_coerce,
+                              parse_cache=self.parse_cache,
+                              compiled=self.compiled)
         return engine
 
     # TODO: add unit tests for this method.
@@ -453,7 +485,7 @@ class Renderer(object):
         if is_string(template):
             return self._render_string(template, *context, **kwargs)
         if isinstance(template, ParsedTemplate):
-            render_func = lambda engine, stack: template.render(engine, stack)
+            render_func = lambda engine, stack: engine.render_parsed(template, stack)
             return self._render_final(render_func, *context, **kwargs)
         # Otherwise, we assume the template is an object.
 
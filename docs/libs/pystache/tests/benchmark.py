@@ -8,14 +8,42 @@ Usage:
 
 tests/benchmark.py 10000
 
+To benchmark the Cinder docs templates instead of the built-in examples,
+record the template contexts of a docs build and pass the recording:
+
+docs$ python generateDocs.py --full --record-contexts contexts.json
+docs/libs$ python -m pystache.tests.benchmark --contexts ../contexts.json 100
+
+This reports the renders per second of each recorded template, interpreted
+and compiled, and the allocations of a compiled render: the peak number of
+objects it holds at the same time, and the number of objects a render leaves
+alive on average.  Only objects tracked by the garbage collector, which
+excludes strings, are counted.  Where the tracemalloc module is available
+(Python 3.4 or the pytracemalloc backport), the peak memory allocated during
+a render is reported as well.
+
 """
 
+import gc
+import json
+import os
 import sys
+from optparse import OptionParser
 from timeit import Timer
 
 import pystache
+from pystache.renderer import Renderer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
 
-# TODO: make the example realistic.
+# The Cinder docs templates, relative to this file.
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir,
+                            'htmlsrc', '_templates')
+TEMPLATE_EXTENSION = 'mustache'
 
 examples = [
     # Test case: 1
@@ -72,10 +100,150 @@ def make_test_function(example):
     return test
 
 
+def read_templates(template_dir):
+    """
+    Return a dictionary of the templates in a directory, keyed by name.
+
+    """
+    templates = {}
+    for file_name in os.listdir(template_dir):
+        name, extension = os.path.splitext(file_name)
+        if extension != os.extsep + TEMPLATE_EXTENSION:
+            continue
+        path = os.path.join(template_dir, file_name)
+        with open(path, 'rb') as f:
+            templates[name] = f.read().decode('utf-8')
+
+    return templates
+
+
+def count_peak_objects(render):
+    """
+    Return the peak number of garbage collected objects that a call to
+    render() allocates and holds at the same time.
+
+    With the collector disabled, the count of its youngest generation is the
+    number of objects allocated and not yet freed since the last collection.
+    That count is sampled at every function call and return.
+
+    """
+    peak = [0]
+
+    def sample(frame, event, arg):
+        peak[0] = max(peak[0], gc.get_count()[0])
+
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    sys.setprofile(sample)
+    try:
+        render()
+    finally:
+        sys.setprofile(None)
+        if enabled:
+            gc.enable()
+
+    return peak[0]
+
+
+def count_retained_objects(render, count):
+    """
+    Return the number of garbage collected objects that each of count calls
+    to render() leaves alive, on average.
+
+    """
+    gc.collect()
+    start = len(gc.get_objects())
+    for i in range(count):
+        render()
+    gc.collect()
+
+    return (len(gc.get_objects()) - start) / float(count)
+
+
+def measure_traced_peak(render):
+    """
+    Return the peak memory in KiB allocated by a call to render(), or None
+    if tracemalloc is not available.
+
+    """
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+    try:
+        render()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / 1024.0
+
+
+def benchmark_templates(contexts_path, template_dir, count):
+    """
+    Benchmark the templates of a context recording (see the module docstring).
+
+    """
+    with open(contexts_path, 'rb') as f:
+        recording = json.loads(f.read().decode('utf-8'))
+
+    # Partials are loaded from memory so that no file access is timed.
+    templates = read_templates(template_dir)
+    renderers = [Renderer(string_encoding='utf-8', decode_errors='xmlcharrefreplace',
+                          partials=templates, compiled=compiled)
+                 for compiled in (False, True)]
+
+    print "Benchmarking templates in %s: %sx" % (template_dir, count)
+    print
+    columns = ["template", "ops/sec", "compiled", "peak objs", "retained"]
+    if tracemalloc is not None:
+        columns.append("peak KiB")
+    print "%-36s %14s %14s %10s %10s" % tuple(columns[:5]) + "".join(" %10s" % column for column in columns[5:])
+
+    for entry in recording['templates']:
+        name = os.path.splitext(entry['template'])[0]
+        context = entry['context']
+        # Templates are rendered parsed, as the docs generator does.
+        parsed = pystache.parse(templates[name])
+
+        results = []
+        for renderer in renderers:
+            render = lambda: renderer.render(parsed, context)
+            results.append(render())
+
+            t = Timer(render)
+            results.append(count / min(t.repeat(repeat=3, number=count)))
+
+        if results[0] != results[2]:
+            raise Exception("Benchmark mismatch in %s: compiled output differs" % entry['template'])
+
+        render = lambda: renderers[1].render(parsed, context)
+        row = [entry['template'], results[1], results[3], count_peak_objects(render),
+               count_retained_objects(render, count)]
+        if tracemalloc is not None:
+            row.append("%.1f" % measure_traced_peak(render))
+
+        print "%-36s %14.1f %14.1f %10d %10.1f" % tuple(row[:5]) + "".join(" %10s" % value for value in row[5:])
+
+    print "Done"
+
+
 def main(sys_argv):
-    args = sys_argv[1:]
+    parser = OptionParser(usage="%prog [options] count")
+    parser.add_option("--contexts", metavar="PATH",
+                      help="benchmark the templates of a recording of docs template contexts")
+    parser.add_option("--templates", metavar="DIR", default=TEMPLATE_DIR,
+                      help="directory of the recorded templates [default: the Cinder docs templates]")
+    options, args = parser.parse_args(sys_argv[1:])
+    if len(args) != 1:
+        parser.error("expected a count")
     count = int(args[0])
 
+    if options.contexts:
+        benchmark_templates(options.contexts, os.path.normpath(options.templates), count)
+        return
+
     print "Benchmarking: %sx" % count
     print
 
@@ -46,6 +46,7 @@ else:
 
 
 import codecs
+import copy
 import glob
 import os.path
 import unittest
@@ -109,8 +110,11 @@ def _read_spec_tests(path):
 
     cases = []
     for data in tests:
-        case = _deserialize_spec_test(data, path)
-        cases.append(case)
+        # Each test also runs with compiled templates.  Every case gets
+        # its own copy of the data since lambdas are created per case.
+        for compiled in (False, True):
+            case = _deserialize_spec_test(copy.deepcopy(data), path, compiled)
+            cases.append(case)
 
     return cases
 
@@ -146,7 +150,7 @@ def _convert_children(node):
         continue
 
 
-def _deserialize_spec_test(data, file_path):
+def _deserialize_spec_test(data, file_path, compiled=False):
     """
     Return a unittest.TestCase instance representing a spec test.
 
@@ -154,6 +158,8 @@ def _deserialize_spec_test(data, file_path):
 
       data: the dictionary of attributes for a single test.
 
+      compiled: whether the test renders with compiled templates.
+
     """
     context = data['data']
     description = data['desc']
@@ -166,18 +172,21 @@ def _deserialize_spec_test(data, file_path):
 
     _convert_children(context)
 
-    test_case = _make_spec_test(expected, template, context, partials, description, test_name, file_path)
+    test_case = _make_spec_test(expected, template, context, partials, description, test_name, file_path, compiled)
 
     return test_case
 
 
-def _make_spec_test(expected, template, context, partials, description, test_name, file_path):
+def _make_spec_test(expected, template, context, partials, description, test_name, file_path,
+                    compiled=False):
     """
     Return a unittest.TestCase instance representing a spec test.
 
     """
     file_name  = os.path.basename(file_path)
     test_method_name = "Mustache spec (%s): %s" % (file_name, repr(test_name))
+    if compiled:
+        test_method_name += " [compiled]"
 
     # We subclass SpecTestBase in order to control the test method name (for
     # the purposes of improved reporting).
@@ -194,6 +203,7 @@ def _make_spec_test(expected, template, context, partials, description, test_nam
     setattr(SpecTest, test_method_name, run_test)
     case = SpecTest(test_method_name)
 
+    case._compiled = compiled
     case._context = context
     case._description = description
     case._expected = expected
@@ -244,6 +254,7 @@ def parse(u):
 class SpecTestBase(unittest.TestCase, AssertStringMixin):
 
     def _runTest(self):
+        compiled = self._compiled
         context = self._context
         description = self._description
         expected = self._expected
@@ -252,7 +263,12 @@ class SpecTestBase(unittest.TestCase, AssertStringMixin):
         template = self._template
         test_name = self._test_name
 
-        renderer = Renderer(partials=partials)
+        # The lambdas of the "Interpolation - Multiple Calls" test count
+        # their calls in this module's globals, which we reset since the
+        # test runs once per rendering mode.
+        globals().pop('calls', None)
+
+        renderer = Renderer(partials=partials, compiled=compiled)
         actual = renderer.render(template, context)
 
         # We need to escape the strings that occur in our format string because
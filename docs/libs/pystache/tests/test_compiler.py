@@ -0,0 +1,112 @@
+# coding: utf-8
+
+"""
+Unit tests of compiler.py.
+
+"""
+
+import unittest
+
+from pystache.compiler import compile_source, compile_template
+from pystache.context import ContextStack
+from pystache.parser import parse
+from pystache.renderer import Renderer
+from pystache.tests import test_renderengine
+
+
+class CompileTemplateTestCase(unittest.TestCase):
+
+    """Tests compile_template() and ParsedTemplate.compile()."""
+
+    def _render(self, template, context):
+        engine = Renderer()._make_render_engine()
+        render = compile_template(parse(template))
+
+        return render(engine, ContextStack(context))
+
+    def test_compile_template(self):
+        actual = self._render(u"Hi {{name}}{{^name}}you{{/name}}!", {'name': 'Mom'})
+        self.assertEqual(actual, u"Hi Mom!")
+
+    def test_compile_template__nested_sections(self):
+        context = {'rows': [{'cols': [1, 2]}, {'cols': [3]}]}
+        actual = self._render(u"{{#rows}}[{{#cols}}{{.}}{{/cols}}]{{/rows}}", context)
+        self.assertEqual(actual, u"[12][3]")
+
+    def test_compile_template__empty_section(self):
+        actual = self._render(u"a{{#x}}{{/x}}{{^x}}{{/x}}b", {'x': True})
+        self.assertEqual(actual, u"ab")
+
+    def test_compile_template__literals(self):
+        """
+        Test that literal text is not interpreted as Python source.
+
+        """
+        template = u"''' \"\"\" \\n %s {0} \\"
+        self.assertEqual(self._render(template, {}), template)
+
+    def test_compile_source(self):
+        source = compile_source(parse(u"Hi {{name}}"))
+        self.assertTrue(source.startswith("def render(engine, context):\n"))
+        self.assertFalse("Hi" in source)
+
+    def test_compile__cached(self):
+        """
+        Test that ParsedTemplate.compile() compiles once.
+
+        """
+        parsed_template = parse(u"Hi {{name}}")
+        self.assertTrue(parsed_template.compile() is parsed_template.compile())
+
+
+class CompiledRenderTests(test_renderengine.RenderTests):
+
+    """
+    Runs the RenderEngine.render() tests with compiled templates.
+
+    """
+
+    def _engine(self):
+        engine = super(CompiledRenderTests, self)._engine()
+        engine.compiled = True
+
+        return engine
+
+
+class RendererTestCase(unittest.TestCase):
+
+    """Tests rendering with Renderer(compiled=True)."""
+
+    def test_render(self):
+        renderer = Renderer(compiled=True)
+        actual = renderer.render(u"{{#list}}<{{item}}>{{/list}}", {'list': [{'item': 'a&b'}]})
+        self.assertEqual(actual, u"<a&amp;b>")
+
+    def test_render__partials(self):
+        partials = {'row': u"{{#cells}}{{.}},{{/cells}}"}
+        renderer = Renderer(partials=partials, compiled=True)
+        actual = renderer.render(u"{{#rows}}{{>row}}\n{{/rows}}", {'rows': [{'cells': [1, 2]}]})
+        self.assertEqual(actual, u"1,2,\n")
+
+    def test_render__parsed_template(self):
+        """
+        Test that rendering a ParsedTemplate instance uses the compiled function.
+
+        """
+        parsed_template = parse(u"Hi {{name}}")
+        renderer = Renderer(compiled=True)
+
+        self.assertEqual(renderer.render(parsed_template, {'name': 'Mom'}), u"Hi Mom")
+        self.assertTrue(parsed_template._compiled is not None)
+
+    def test_render__parse_cache(self):
+        """
+        Test that a cached template is compiled once.
+
+        """
+        renderer = Renderer(compiled=True)
+        renderer.render(u"Hi {{name}}", {'name': 'Mom'})
+        render = renderer.parse_cache.parse(u"Hi {{name}}").compile()
+        renderer.render(u"Hi {{name}}", {'name': 'Dad'})
+
+        self.assertTrue(renderer.parse_cache.parse(u"Hi {{name}}").compile() is render)
@@ -9,6 +9,7 @@ import unittest
 
 from pystache.defaults import DELIMITERS
 from pystache.parser import _compile_template_re as make_re
+from pystache.parser import ParseCache
 
 
 class RegularExpressionTestCase(unittest.TestCase):
@@ -25,3 +26,63 @@ class RegularExpressionTestCase(unittest.TestCase):
 
         self.assertEqual(match.start(), 1)
 
+
+class ParseCacheTestCase(unittest.TestCase):
+
+    """Tests the ParseCache class."""
+
+    def test_parse(self):
+        """
+        Test that a template is parsed once.
+
+        """
+        cache = ParseCache(2)
+        parsed = cache.parse(u"Hi {{name}}")
+
+        self.assertEqual(str(parsed), str(cache.parse(u"Hi {{name}}")))
+        self.assertTrue(cache.parse(u"Hi {{name}}") is parsed)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 2)
+
+    def test_parse__delimiters(self):
+        """
+        Test that templates are cached per delimiters.
+
+        """
+        cache = ParseCache(4)
+        parsed = cache.parse(u"{{a}} <%b%>")
+        other = cache.parse(u"{{a}} <%b%>", [u"<%", u"%>"])
+
+        self.assertFalse(parsed is other)
+        self.assertTrue(cache.parse(u"{{a}} <%b%>", (u"<%", u"%>")) is other)
+        self.assertTrue(cache.parse(u"{{a}} <%b%>", DELIMITERS) is parsed)
+        self.assertEqual(cache.misses, 2)
+
+    def test_parse__least_recently_used(self):
+        """
+        Test that the least recently used template is discarded.
+
+        """
+        cache = ParseCache(2)
+        first = cache.parse(u"{{a}}")
+        cache.parse(u"{{b}}")
+        cache.parse(u"{{a}}")
+        cache.parse(u"{{c}}")
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.parse(u"{{a}}") is first)
+        cache.parse(u"{{b}}")
+        self.assertEqual(cache.misses, 4)
+
+    def test_parse__disabled(self):
+        """
+        Test that a max_size of 0 disables caching.
+
+        """
+        cache = ParseCache(0)
+        cache.parse(u"{{a}}")
+        cache.parse(u"{{a}}")
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 0)
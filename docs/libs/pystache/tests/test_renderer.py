@@ -181,6 +181,22 @@ class RendererInitTestCase(unittest.TestCase):
         renderer = Renderer(string_encoding="foo")
         self.assertEqual(renderer.string_encoding, "foo")
 
+    def test_parse_cache_size__default(self):
+        """
+        Check the parse_cache_size default.
+
+        """
+        renderer = Renderer()
+        self.assertEqual(renderer.parse_cache.max_size, 256)
+
+    def test_parse_cache_size(self):
+        """
+        Check that the constructor sets the parse cache size correctly.
+
+        """
+        renderer = Renderer(parse_cache_size=3)
+        self.assertEqual(renderer.parse_cache.max_size, 3)
+
 
 class RendererTests(unittest.TestCase, AssertStringMixin):
 
@@ -368,6 +384,23 @@ class RendererTests(unittest.TestCase, AssertStringMixin):
         #   TypeError: decoding Unicode is not supported
         self.assertEqual(resolve_partial("partial"), "foo")
 
+    def test_render__parse_cache(self):
+        """
+        Test that repeated partials are parsed once and counted.
+
+        """
+        renderer = Renderer(partials={'item': u'<{{.}}>'})
+        template = u'{{#list}}{{>item}}{{/list}}'
+        actual = renderer.render(template, {'list': ['a', 'b', 'c']})
+
+        self.assertString(actual, u'<a><b><c>')
+        self.assertEqual(renderer.parse_cache_misses, 2)
+        self.assertEqual(renderer.parse_cache_hits, 2)
+
+        renderer.render(template, {'list': ['d']})
+        self.assertEqual(renderer.parse_cache_misses, 2)
+        self.assertEqual(renderer.parse_cache_hits, 4)
+
     def test_render_name(self):
         """Test the render_name() method."""
         data_dir = get_data_path()
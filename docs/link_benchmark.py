@@ -0,0 +1,76 @@
+"""
+Micro-benchmark of the link resolution in generateDocs.py.
+
+Resolves the links of the master template the way rewrite_links does for pages in a few output directories,
+once with the path resolver's cache turned off and once with it on, and prints the cost per link.
+
+Usage: python link_benchmark.py [pages per directory]
+"""
+
+import os
+import sys
+from timeit import Timer
+
+# generateDocs adds the bundled libs to the path
+import generateDocs
+from generateDocs import BASE_PATH, HTML_DEST_PATH, LINK_ATTRIBUTES, TEMPLATE_PATH, PathResolver
+from bs4 import BeautifulSoup
+
+# output directories of the pages, relative to the html directory
+PAGE_DIRS = ["", "reference", "guides", "guides/opengl", "guides/tour", "guides/path2d"]
+
+
+def get_template_links():
+    """
+    Collects the urls of the master template
+    :return: list of urls
+    """
+    with open(os.path.join(TEMPLATE_PATH, "master-template.mustache"), "rb") as template_file:
+        html = BeautifulSoup(template_file.read().decode("utf-8"))
+
+    links = []
+    for name, attr in LINK_ATTRIBUTES.iteritems():
+        for tag in html.find_all(name):
+            if tag.has_attr(attr):
+                links.append(tag[attr])
+    return links
+
+
+def resolve_pages(resolver, links, page_count):
+    """
+    Resolves the links of page_count pages in each of the page directories, like rewrite_links does
+    :return: list of the resolved links
+    """
+    results = []
+    for page_dir in PAGE_DIRS:
+        for page in range(page_count):
+            save_path = os.path.join(HTML_DEST_PATH, page_dir, "page%d.html" % page)
+            for link in links:
+                results.append(resolver.resolve(link, (TEMPLATE_PATH,), TEMPLATE_PATH, save_path))
+    return results
+
+
+def main(argv):
+    page_count = int(argv[1]) if len(argv) > 1 else 100
+    links = get_template_links()
+    link_count = len(links) * len(PAGE_DIRS) * page_count
+
+    print "Resolving %d links of the master template for %d pages in %d directories" % (
+        len(links), page_count, len(PAGE_DIRS))
+
+    expected = None
+    for label, max_size in (("uncached", 0), ("cached", generateDocs.PATH_CACHE_SIZE)):
+        resolver = PathResolver(BASE_PATH, max_size)
+        results = resolve_pages(resolver, links, page_count)
+        if expected is None:
+            expected = results
+        elif results != expected:
+            raise Exception("Benchmark mismatch: %s links differ from uncached links" % label)
+
+        timer = Timer(lambda: resolve_pages(PathResolver(BASE_PATH, max_size), links, page_count))
+        seconds = min(timer.repeat(repeat=3, number=1))
+        print "%-10s %8.2f us per link" % (label, seconds * 1000000.0 / link_count)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
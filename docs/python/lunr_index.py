@@ -0,0 +1,235 @@
+"""
+Builds serialized lunr indexes at doc generation time.
+
+This is a port of the indexing side of lunr.js 0.5.10 (htmlsrc/_assets/js/lunr.min.js): the tokenizer, the default
+trimmer / stop word filter / stemmer pipeline and Index.add. LunrIndex.iter_postings returns the term frequencies that
+lunr would compute in the browser, which generateDocs.py writes to the search index shards so the page only has to
+load them instead of adding every document again.
+"""
+
+import re
+
+# names of the pipeline functions, as registered in lunr
+PIPELINE = ["trimmer", "stopWordFilter", "stemmer"]
+
+# javascript's \s and the characters String.trim strips, which also cover the unicode spaces
+JS_WHITESPACE = u"\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+
+TOKEN_SEPARATOR = re.compile(u"[%s\\-]+" % JS_WHITESPACE)
+SURROUNDING_WHITESPACE = re.compile(u"^[%s]+|[%s]+$" % (JS_WHITESPACE, JS_WHITESPACE))
+LEADING_NON_WORD = re.compile(r"^[^A-Za-z0-9_]+")
+TRAILING_NON_WORD = re.compile(r"[^A-Za-z0-9_]+$")
+
+STOP_WORDS = frozenset([
+    "", "a", "able", "about", "across", "after", "all", "almost", "also", "am", "among", "an", "and", "any", "are",
+    "as", "at", "be", "because", "been", "but", "by", "can", "cannot", "could", "dear", "did", "do", "does", "either",
+    "else", "ever", "every", "for", "from", "get", "got", "had", "has", "have", "he", "her", "hers", "him", "his",
+    "how", "however", "i", "if", "in", "into", "is", "it", "its", "just", "least", "let", "like", "likely", "may",
+    "me", "might", "most", "must", "my", "neither", "no", "nor", "not", "of", "off", "often", "on", "only", "or",
+    "other", "our", "own", "rather", "said", "say", "says", "she", "should", "since", "so", "some", "than", "that",
+    "the", "their", "them", "then", "there", "these", "they", "this", "tis", "to", "too", "twas", "us", "wants",
+    "was", "we", "were", "what", "when", "where", "which", "while", "who", "whom", "why", "will", "with", "would",
+    "yet", "you", "your"])
+
+
+def tokenize(value):
+    """
+    Splits a field value into tokens like lunr.tokenizer
+    :param value: string, list of strings or None
+    :return: list of lowercase tokens
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [item.lower() for item in value]
+    return TOKEN_SEPARATOR.split(SURROUNDING_WHITESPACE.sub(u"", unicode(value)).lower())
+
+
+def trim(token):
+    """
+    Strips non word characters from both ends of the token like lunr.trimmer
+    """
+    return TRAILING_NON_WORD.sub("", LEADING_NON_WORD.sub("", token))
+
+
+# =============================================================================================== Stemmer
+
+STEP_2_SUFFIXES = {
+    "ational": "ate", "tional": "tion", "enci": "ence", "anci": "ance", "izer": "ize", "bli": "ble", "alli": "al",
+    "entli": "ent", "eli": "e", "ousli": "ous", "ization": "ize", "ation": "ate", "ator": "ate", "alism": "al",
+    "iveness": "ive", "fulness": "ful", "ousness": "ous", "aliti": "al", "iviti": "ive", "biliti": "ble",
+    "logi": "log"}
+
+STEP_3_SUFFIXES = {"icate": "ic", "ative": "", "alize": "al", "iciti": "ic", "ical": "ic", "ful": "", "ness": ""}
+
+CONSONANT = "[^aeiou]"
+VOWEL = "[aeiouy]"
+CONSONANTS = CONSONANT + "[^aeiouy]*"
+VOWELS = VOWEL + "[aeiou]*"
+
+MEASURE_GT_0 = re.compile("^(" + CONSONANTS + ")?" + VOWELS + CONSONANTS)
+MEASURE_EQ_1 = re.compile("^(" + CONSONANTS + ")?" + VOWELS + CONSONANTS + "(" + VOWELS + ")?$")
+MEASURE_GT_1 = re.compile("^(" + CONSONANTS + ")?" + VOWELS + CONSONANTS + VOWELS + CONSONANTS)
+HAS_VOWEL = re.compile("^(" + CONSONANTS + ")?" + VOWEL)
+
+STEP_1A_1 = re.compile("^(.+?)(ss|i)es$")
+STEP_1A_2 = re.compile("^(.+?)([^s])s$")
+STEP_1B_1 = re.compile("^(.+?)eed$")
+STEP_1B_2 = re.compile("^(.+?)(ed|ing)$")
+LAST_CHAR = re.compile(".$")
+STEP_1B_3 = re.compile("(at|bl|iz)$")
+DOUBLE_CONSONANT = re.compile(r"([^aeiouylsz])\1$")
+CVC = re.compile("^" + CONSONANTS + VOWEL + "[^aeiouwxy]$")
+STEP_1C = re.compile("^(.+?[^aeiou])y$")
+STEP_2 = re.compile("^(.+?)(" + "|".join([
+    "ational", "tional", "enci", "anci", "izer", "bli", "alli", "entli", "eli", "ousli", "ization", "ation", "ator",
+    "alism", "iveness", "fulness", "ousness", "aliti", "iviti", "biliti", "logi"]) + ")$")
+STEP_3 = re.compile("^(.+?)(icate|ative|alize|iciti|ical|ful|ness)$")
+STEP_4_1 = re.compile("^(.+?)(al|ance|ence|er|ic|able|ible|ant|ement|ment|ent|ou|ism|ate|iti|ous|ive|ize)$")
+STEP_4_2 = re.compile("^(.+?)(s|t)(ion)$")
+STEP_5 = re.compile("^(.+?)e$")
+STEP_5_LL = re.compile("ll$")
+
+
+def stem(word):
+    """
+    Porter stemmer, following lunr.stemmer step by step so the stems match the ones of search queries
+    """
+    if len(word) < 3:
+        return word
+
+    first_char = word[0]
+    if first_char == "y":
+        word = first_char.upper() + word[1:]
+
+    # step 1a
+    if STEP_1A_1.search(word):
+        word = STEP_1A_1.sub(r"\1\2", word, 1)
+    elif STEP_1A_2.search(word):
+        word = STEP_1A_2.sub(r"\1\2", word, 1)
+
+    # step 1b
+    match = STEP_1B_1.search(word)
+    if match:
+        if MEASURE_GT_0.search(match.group(1)):
+            word = LAST_CHAR.sub("", word, 1)
+    else:
+        match = STEP_1B_2.search(word)
+        if match:
+            stem_part = match.group(1)
+            if HAS_VOWEL.search(stem_part):
+                word = stem_part
+                if STEP_1B_3.search(word):
+                    word += "e"
+                elif DOUBLE_CONSONANT.search(word):
+                    word = LAST_CHAR.sub("", word, 1)
+                elif CVC.search(word):
+                    word += "e"
+
+    # step 1c
+    match = STEP_1C.search(word)
+    if match:
+        word = match.group(1) + "i"
+
+    # step 2
+    match = STEP_2.search(word)
+    if match and MEASURE_GT_0.search(match.group(1)):
+        word = match.group(1) + STEP_2_SUFFIXES[match.group(2)]
+
+    # step 3
+    match = STEP_3.search(word)
+    if match and MEASURE_GT_0.search(match.group(1)):
+        word = match.group(1) + STEP_3_SUFFIXES[match.group(2)]
+
+    # step 4
+    match = STEP_4_1.search(word)
+    if match:
+        if MEASURE_GT_1.search(match.group(1)):
+            word = match.group(1)
+    else:
+        match = STEP_4_2.search(word)
+        if match:
+            stem_part = match.group(1) + match.group(2)
+            if MEASURE_GT_1.search(stem_part):
+                word = stem_part
+
+    # step 5
+    match = STEP_5.search(word)
+    if match:
+        stem_part = match.group(1)
+        if MEASURE_GT_1.search(stem_part) or (MEASURE_EQ_1.search(stem_part) and not CVC.search(stem_part)):
+            word = stem_part
+
+    if STEP_5_LL.search(word) and MEASURE_GT_1.search(word):
+        word = LAST_CHAR.sub("", word, 1)
+
+    if first_char == "y":
+        word = first_char.lower() + word[1:]
+
+    return word
+
+
+def run_pipeline(tokens, stem_cache):
+    """
+    Runs the tokens through the trimmer, stop word filter and stemmer
+    :param tokens: list of tokens
+    :param stem_cache: dict of memoized results per token
+    :return: list of the tokens that made it through
+    """
+    results = []
+    for token in tokens:
+        if token not in stem_cache:
+            trimmed = trim(token)
+            stem_cache[token] = None if trimmed in STOP_WORDS else stem(trimmed)
+        result = stem_cache[token]
+        if result is not None:
+            results.append(result)
+    return results
+
+
+# =============================================================================================== Index
+
+class LunrIndex(object):
+    """
+    Index of the term frequencies of the documents, as lunr.Index.add computes them
+    """
+
+    def __init__(self, fields, ref="id"):
+        """
+        :param fields: list of (field name, boost) tuples
+        :param ref: name of the document field that identifies the documents
+        """
+        self.fields = [{"name": name, "boost": boost} for name, boost in fields]
+        self.ref = ref
+        # lists of (ref, tf) tuples per token
+        self.postings = {}
+        self.stem_cache = {}
+
+    def add(self, doc):
+        """
+        Adds a document like lunr.Index.add
+        :param doc: dict with the ref and field values
+        """
+        ref = doc[self.ref]
+        field_tokens = []
+        doc_tokens = set()
+        for field in self.fields:
+            tokens = run_pipeline(tokenize(doc.get(field["name"])), self.stem_cache)
+            field_tokens.append((tokens, field["boost"]))
+            doc_tokens.update(tokens)
+
+        for token in sorted(doc_tokens):
+            # same summation order as lunr, so the float values match exactly
+            tf = 0
+            for tokens, boost in field_tokens:
+                if tokens:
+                    tf = tf + tokens.count(token) / float(len(tokens)) * boost
+            self.postings.setdefault(token, []).append((ref, tf))
+
+    def iter_postings(self):
+        """
+        Iterates over the tokens of the index in the order of lunr's corpus tokens
+        :return: iterator of (token, list of (ref, tf) tuples) tuples
+        """
+        for token in sorted(self.postings):
+            yield token, self.postings[token]
@@ -1,18 +1,338 @@
+import atexit
+import codecs
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
 # =============================================================================================== Logging
 
+LEVEL_NAMES = {0: "INFO", 1: "WARNING", 2: "ERROR"}
+
+
 class Logger(object):
-    
-    def log(self, message, level=0):
-        if level == 0 or not level:
-            message_prefix = "INFO"
-        elif level == 1:
-            message_prefix = "WARNING"
-        elif level == 2:
-            message_prefix = "ERROR"
-
-        print("\r    *** " + message_prefix + ": [ " + message + " ] ***")
-
-    def log_progress(message):
-        sys.stdout.write('\r' + str(message))
-        sys.stdout.write("\033[K")
-        sys.stdout.flush()
\ No newline at end of file
+    """
+    Console logger that buffers its output and only shows the first few occurrences of a repeated message, counting
+    the rest for a summary at the end. Every message can also be written to a file as a json line.
+
+    Worker processes capture their messages instead of writing them (see start_capture), and the parent process
+    replays them, so the console and the log file only ever have one writer.
+    """
+
+    def __init__(self, log_path=None, stream=None, buffer_lines=100, repeat_limit=3, progress_interval=0.1):
+        """
+        :param log_path: file to append json lines to, or None
+        :param stream: console stream, stdout by default
+        :param buffer_lines: number of console lines that are buffered before they are written out
+        :param repeat_limit: number of times a message (or messages with the same key) is shown on the console
+        :param progress_interval: minimum number of seconds between progress updates
+        """
+        self.stream = stream or sys.stdout
+        self.buffer = []
+        self.buffer_lines = buffer_lines
+        self.repeat_limit = repeat_limit
+        # [level, count] per message key, and the keys in the order they were first logged
+        self.repeats = {}
+        self.repeat_keys = []
+        # progress lines overwrite each other, which only makes sense on a terminal
+        self.show_progress = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.progress_interval = progress_interval
+        self.last_progress = 0
+        self.log_file = None
+        self.records = []
+        if log_path:
+            self.log_file = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0644)
+        # messages of a worker process, handed back to the parent process
+        self.captured = None
+        atexit.register(self.close)
+
+    def log(self, message, level=0, key=None, console=True):
+        """
+        :param message: message to log
+        :param level: 0 for info, 1 for warning, 2 for error
+        :param key: messages with the same key count as repeats of each other, by default only identical messages do
+        :param console: False to only write the message to the log file
+        """
+        message = unicode(message) if isinstance(message, unicode) else str(message)
+        level = int(level or 0)
+        if self.captured is not None:
+            self.captured.append((message, level, key, console, time.time()))
+        else:
+            self.emit(message, level, key, console, time.time())
+
+    def emit(self, message, level, key, console, timestamp):
+        if self.log_file is not None:
+            record = {"time": timestamp, "level": LEVEL_NAMES.get(level, level), "message":
+                      message.decode("utf-8", "replace") if isinstance(message, str) else message}
+            if key is not None:
+                record["key"] = key
+            self.records.append(json.dumps(record))
+
+        if console:
+            repeat_key = key if key is not None else message
+            repeat = self.repeats.get(repeat_key)
+            if repeat is None:
+                repeat = self.repeats[repeat_key] = [level, 0]
+                self.repeat_keys.append(repeat_key)
+            repeat[1] += 1
+            if repeat[1] <= self.repeat_limit:
+                if isinstance(message, unicode):
+                    message = message.encode("utf-8")
+                self.buffer.append("\r    *** " + LEVEL_NAMES.get(level, "INFO") + ": [ " + message + " ] ***")
+
+        if level >= 2 or len(self.buffer) >= self.buffer_lines or len(self.records) >= self.buffer_lines:
+            self.flush()
+
+    def log_progress(self, message):
+        """
+        Overwrites the current line of the terminal with the message, at most every progress_interval seconds
+        """
+        if not self.show_progress or self.captured is not None:
+            return
+        now = time.time()
+        if now - self.last_progress < self.progress_interval:
+            return
+        self.last_progress = now
+        self.flush()
+        self.stream.write('\r' + str(message) + "\033[K")
+        self.stream.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write("\n".join(self.buffer) + "\n")
+            self.stream.flush()
+            self.buffer = []
+        if self.records:
+            # a single append of whole lines, so that lines never interleave with other writers
+            os.write(self.log_file, "\n".join(self.records) + "\n")
+            self.records = []
+
+    def start_capture(self):
+        """
+        Captures the messages of a page processed in a worker process, instead of writing them out
+        """
+        # drop the output the worker inherited from the parent process when it was forked, the parent writes it
+        self.buffer = []
+        self.records = []
+        self.captured = []
+
+    def stop_capture(self):
+        """
+        :return: list of the captured messages, for replay
+        """
+        captured = self.captured
+        self.captured = None
+        return captured
+
+    def replay(self, captured):
+        """
+        Logs the messages captured by a worker process
+        :param captured: list returned by stop_capture
+        """
+        for message in captured:
+            self.emit(*message)
+
+    def close(self):
+        """
+        Writes out the buffered output, with a count of the repeated messages that were not shown
+        """
+        for key in self.repeat_keys:
+            level, count = self.repeats[key]
+            if count > self.repeat_limit:
+                if isinstance(key, unicode):
+                    key = key.encode("utf-8")
+                self.buffer.append("\r    *** " + LEVEL_NAMES.get(level, "INFO") + ": [ " + key + " ] *** repeated "
+                                   + str(count - self.repeat_limit) + " more times")
+        self.repeats = {}
+        self.repeat_keys = []
+        self.flush()
+
+        if self.log_file is not None:
+            os.close(self.log_file)
+            self.log_file = None
+
+
+# =============================================================================================== Profiling
+
+def get_cpu_time():
+    """
+    User and system time of this process and of its finished child processes, so that the work of worker processes
+    counts towards the phase that ran them
+    """
+    times = os.times()
+    return times[0] + times[1] + times[2] + times[3]
+
+
+class Profiler(object):
+    """
+    Records wall and cpu time per build phase and per page, and counts symbol lookups
+    """
+
+    def __init__(self):
+        # phase names in the order they first ran, and their [wall, cpu] totals
+        self.phase_names = []
+        self.phase_times = {}
+        # stack of [phase name, wall start, cpu start] of the running phases
+        self.phase_stack = []
+        # [path, wall, cpu, skipped] per page
+        self.pages = []
+        # call counts per lookup method, and per looked up name
+        self.lookup_calls = {}
+        self.lookup_names = {}
+        self.start_wall = time.time()
+        self.start_cpu = get_cpu_time()
+
+    def charge_phase(self, wall, cpu):
+        """
+        Adds the time since the innermost phase started (or resumed) to it, and restarts its clock
+        """
+        if not self.phase_stack:
+            return
+        current = self.phase_stack[-1]
+        totals = self.phase_times[current[0]]
+        totals[0] += wall - current[1]
+        totals[1] += cpu - current[2]
+        current[1] = wall
+        current[2] = cpu
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Times a build phase. Phases can nest, in which case the outer phase is paused while the inner one runs, so
+        each phase only counts its own time
+        :param name: name of the phase in the report
+        """
+        if name not in self.phase_times:
+            self.phase_names.append(name)
+            self.phase_times[name] = [0.0, 0.0]
+
+        wall = time.time()
+        cpu = get_cpu_time()
+        self.charge_phase(wall, cpu)
+        self.phase_stack.append([name, wall, cpu])
+        try:
+            yield
+        finally:
+            wall = time.time()
+            cpu = get_cpu_time()
+            self.charge_phase(wall, cpu)
+            self.phase_stack.pop()
+            if self.phase_stack:
+                self.phase_stack[-1][1] = wall
+                self.phase_stack[-1][2] = cpu
+
+    @contextmanager
+    def page(self, path):
+        """
+        Times the generation of a page
+        :param path: source of the page
+        :return: dict of the page stats, the caller can flag the page as skipped in it
+        """
+        stats = {"skipped": False}
+        wall = time.time()
+        cpu = time.clock()
+        try:
+            yield stats
+        finally:
+            self.pages.append([path, time.time() - wall, time.clock() - cpu, stats["skipped"]])
+
+    def count_lookup(self, method, args):
+        """
+        Counts a call of a symbol map lookup
+        :param method: name of the lookup method
+        :param args: arguments of the call, the first one is the name that is looked up
+        """
+        self.lookup_calls[method] = self.lookup_calls.get(method, 0) + 1
+        name = args[0] if args else ""
+        # names can be NavigableStrings, which drag their whole document along when pickled
+        if isinstance(name, unicode):
+            name = unicode(name)
+        elif not isinstance(name, str):
+            name = repr(name)
+        key = (method, name)
+        self.lookup_names[key] = self.lookup_names.get(key, 0) + 1
+
+    def take_records(self):
+        """
+        Returns the page timings and lookup counts recorded so far and clears them, for worker processes to hand them
+        back to the parent process
+        :return: dict
+        """
+        records = {"pages": self.pages, "lookup_calls": self.lookup_calls, "lookup_names": self.lookup_names.items()}
+        self.pages = []
+        self.lookup_calls = {}
+        self.lookup_names = {}
+        return records
+
+    def merge_records(self, records):
+        """
+        Merges the records of a worker process returned by take_records
+        """
+        self.pages.extend(records["pages"])
+        for method, count in records["lookup_calls"].iteritems():
+            self.lookup_calls[method] = self.lookup_calls.get(method, 0) + count
+        for key, count in records["lookup_names"]:
+            key = tuple(key)
+            self.lookup_names[key] = self.lookup_names.get(key, 0) + count
+
+    def get_report(self, top=20):
+        """
+        :param top: number of slowest pages and hottest lookups to list
+        :return: dict of the profile
+        """
+        pages = sorted(self.pages, key=lambda page: page[1], reverse=True)
+        names = sorted(self.lookup_names.iteritems(), key=lambda item: item[1], reverse=True)
+        return {
+            "total": {"wall": time.time() - self.start_wall, "cpu": get_cpu_time() - self.start_cpu},
+            "phases": [{"name": name, "wall": self.phase_times[name][0], "cpu": self.phase_times[name][1]}
+                       for name in self.phase_names],
+            "pages": {
+                "count": len(pages),
+                "skipped": sum(1 for page in pages if page[3]),
+                "wall": sum(page[1] for page in pages),
+                "slowest": [{"path": path, "wall": wall, "cpu": cpu, "skipped": skipped}
+                            for path, wall, cpu, skipped in pages[:top]]
+            },
+            "lookups": {
+                "calls": dict(self.lookup_calls),
+                "hottest": [{"method": method, "name": name, "calls": count} for (method, name), count in names[:top]]
+            }
+        }
+
+    def write_report(self, path_prefix, top=20):
+        """
+        Writes the profile to path_prefix.json and a readable summary of it to path_prefix.txt
+        :param path_prefix: path of the reports without extension
+        :param top: number of slowest pages and hottest lookups to list
+        """
+        report = self.get_report(top)
+        with open(path_prefix + ".json", "wb") as json_file:
+            json.dump(report, json_file, indent=2, sort_keys=True)
+
+        lines = ["%-40s %10s %10s" % ("phase", "wall (s)", "cpu (s)")]
+        for phase in report["phases"]:
+            lines.append("%-40s %10.3f %10.3f" % (phase["name"], phase["wall"], phase["cpu"]))
+        lines.append("%-40s %10.3f %10.3f" % ("total", report["total"]["wall"], report["total"]["cpu"]))
+
+        pages = report["pages"]
+        lines.append("")
+        lines.append("%d pages (%d skipped as unchanged), %.3f s of page time" % (
+            pages["count"], pages["skipped"], pages["wall"]))
+        lines.append("%-70s %10s %10s" % ("slowest pages", "wall (s)", "cpu (s)"))
+        for page in pages["slowest"]:
+            lines.append("%-70s %10.3f %10.3f%s" % (page["path"], page["wall"], page["cpu"],
+                                                    " (skipped)" if page["skipped"] else ""))
+
+        lookups = report["lookups"]
+        lines.append("")
+        lines.append("%-40s %10s" % ("lookups", "calls"))
+        for method, count in sorted(lookups["calls"].iteritems(), key=lambda item: item[1], reverse=True):
+            lines.append("%-40s %10d" % (method, count))
+        lines.append("")
+        lines.append("%-70s %10s" % ("hottest lookups", "calls"))
+        for lookup in lookups["hottest"]:
+            lines.append("%-70s %10d" % (lookup["method"] + "(" + lookup["name"] + ")", lookup["calls"]))
+
+        with codecs.open(path_prefix + ".txt", "w", "UTF-8") as text_file:
+            text_file.write("\n".join(lines) + "\n")